@@ -0,0 +1,44 @@
+"""Throughput of a 10k-fragment generator body, with and without
+chunk coalescing, through a minimal WSGI server loop.
+
+    python benchmarks/bench_coalesce.py
+"""
+import io
+import timeit
+from horseman.response import Response
+
+
+FRAGMENT = b'{"id": 1234, "name": "fragment"},'
+FRAGMENTS = 10_000
+
+
+def body():
+    for _ in range(FRAGMENTS):
+        yield FRAGMENT
+
+
+def serve(response: Response) -> int:
+    """Mimics a server writing each chunk to the socket."""
+    sink = io.BytesIO()
+    writes = 0
+    for chunk in response:
+        sink.write(chunk)
+        writes += 1
+    return writes
+
+
+def run(buffer_size, number=50):
+    writes = serve(Response(body=body(), buffer_size=buffer_size))
+    duration = timeit.timeit(
+        lambda: serve(Response(body=body(), buffer_size=buffer_size)),
+        number=number
+    ) / number
+    size = len(FRAGMENT) * FRAGMENTS
+    label = f'{buffer_size // 1024} KiB' if buffer_size else 'none'
+    print(f'buffer {label:<8} {writes:>6} writes  '
+          f'{duration * 1e3:7.2f} ms  {size / duration / 2 ** 20:8.1f} MiB/s')
+
+
+if __name__ == '__main__':
+    for buffer_size in (None, 16384, 32768, 65536):
+        run(buffer_size)
@@ -0,0 +1,50 @@
+"""Parsing of recurring Content-Type values: `parse_header`, against
+the former generator based parsing, and `ContentType`, interned or not.
+
+    python benchmarks/bench_content_type.py
+"""
+import timeit
+from horseman.datastructures import ContentType, MediaType
+from horseman.utils import _parseparam, parse_header
+
+
+HEADERS = (
+    'application/json',
+    'application/json; charset=utf-8',
+    'text/html; charset=UTF-8; q=0.9',
+    'multipart/form-data; boundary="----WebKitFormBoundary7MA4YWxk"',
+)
+
+
+def legacy(line: str):
+    parts = _parseparam(";" + line)
+    key = parts.__next__()
+    pdict = {}
+    for p in parts:
+        i = p.find("=")
+        if i >= 0:
+            name = p[:i].strip().lower()
+            value = p[i + 1:].strip()
+            if len(value) >= 2 and value[0] == value[-1] == '"':
+                value = value[1:-1]
+                value = value.replace("\\\\", "\\").replace('\\"', '"')
+            pdict[name] = value
+    return key, pdict
+
+
+def measure(function, value, number=100_000) -> float:
+    return timeit.timeit(lambda: function(value), number=number) / number
+
+
+if __name__ == '__main__':
+    for header in HEADERS:
+        assert legacy(header) == parse_header(header)
+        print(header)
+        for name, function in (
+                ('legacy parse', legacy),
+                ('parse_header', parse_header),
+                ('ContentType', ContentType.create),
+                ('interned', ContentType),
+                ('MediaType', MediaType.create),
+                ('interned', MediaType)):
+            print(f'  {name:<14} {measure(function, header) * 1e6:6.2f} µs')
@@ -0,0 +1,34 @@
+"""Lookup of the session cookie in a 4 KiB Cookie header, as sent by
+browsers carrying analytics cookies: parsing the whole header, against
+scanning it for the cookie.
+
+    python benchmarks/bench_cookies.py
+"""
+import timeit
+from biscuits import parse
+from horseman.datastructures import RequestCookies
+
+
+ANALYTICS = '; '.join(
+    f'_tracker_{i}=GA1.2.{1000000000 + i * 7919}.{1700000000 + i}'
+    for i in range(90)
+)
+HEADERS = {
+    'session first': f'session=f3a9c2e1b7d64a58; {ANALYTICS}',
+    'session last': f'{ANALYTICS}; session=f3a9c2e1b7d64a58',
+    'no session': ANALYTICS,
+}
+
+
+def run(label, function, number=20_000):
+    duration = timeit.timeit(function, number=number) / number
+    print(f'  {label:<8} {duration * 1e6:7.2f} µs')
+
+
+if __name__ == '__main__':
+    for label, header in HEADERS.items():
+        print(f'{label} ({len(header)} bytes)')
+        assert parse(header).get('session') == \
+            RequestCookies(header).get('session')
+        run('parse', lambda: parse(header).get('session'))
+        run('scan', lambda: RequestCookies(header).get('session'))
@@ -0,0 +1,84 @@
+"""Cost of a request wrapper: construction plus the typical attribute
+accesses of a handler, repeated reads of the cached attributes, and
+memory per request once they are cached, for `WSGIEnvironWrapper` and
+the slotted `Request`.
+
+    python benchmarks/bench_environ.py
+"""
+import statistics
+import timeit
+import tracemalloc
+from horseman.environ import Request, WSGIEnvironWrapper
+
+
+ENVIRON = {
+    'REQUEST_METHOD': 'GET',
+    'SCRIPT_NAME': '',
+    'PATH_INFO': '/api/items',
+    'QUERY_STRING': 'page=2&size=20',
+    'SERVER_NAME': 'localhost',
+    'SERVER_PORT': '80',
+    'HTTP_HOST': 'localhost',
+    'HTTP_COOKIE': 'sid=f3a9c2e1b7d64a58; theme=dark',
+    'HTTP_ACCEPT': 'application/json',
+    'wsgi.url_scheme': 'http',
+}
+REQUESTS = 10_000
+
+
+def handle(wrapper):
+    request = wrapper(ENVIRON)
+    request.method
+    request.path
+    request.query.get('page')
+    request.cookies.get('sid')
+    request.content_type
+    request.get('HTTP_ACCEPT')
+    return request
+
+
+def reread(request):
+    for _ in range(10):
+        request.method
+        request.path
+        request.query
+        request.cookies
+        request.content_type
+
+
+def median(functions, number) -> list:
+    """Median time per call of each function. The runs are
+    interleaved, so that a drift of the machine affects them alike.
+    """
+    timings = [[] for _ in functions]
+    for _ in range(15):
+        for timing, function in zip(timings, functions):
+            timing.append(timeit.timeit(function, number=number))
+    return [statistics.median(timing) / number for timing in timings]
+
+
+def memory(wrapper) -> float:
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    requests = [handle(wrapper) for _ in range(REQUESTS)]
+    allocated = sum(
+        stat.size_diff for stat in
+        tracemalloc.take_snapshot().compare_to(snapshot, 'filename'))
+    tracemalloc.stop()
+    del requests
+    return allocated / REQUESTS
+
+
+if __name__ == '__main__':
+    wrappers = (WSGIEnvironWrapper, Request)
+    firsts = median(
+        [lambda wrapper=wrapper: handle(wrapper) for wrapper in wrappers],
+        REQUESTS)
+    requests = [handle(wrapper) for wrapper in wrappers]
+    cached = median(
+        [lambda request=request: reread(request) for request in requests],
+        REQUESTS)
+    for wrapper, first, read in zip(wrappers, firsts, cached):
+        print(f'{wrapper.__name__:<20} request {first * 1e6:6.2f} µs  '
+              f'cached read {read / 50 * 1e9:4.0f} ns  '
+              f'{memory(wrapper):4.0f} bytes per request')
@@ -0,0 +1,66 @@
+"""Compares the prefix-indexed `Mapping.resolve` with the former
+`PurePosixPath` based resolver, for 10, 100 and 1000 mounts.
+
+    python benchmarks/bench_mapping.py
+"""
+import timeit
+from pathlib import PurePosixPath
+from horseman.exceptions import HTTPError
+from horseman.mapping import Mapping
+
+
+def app(environ, start_response):
+    return []
+
+
+def legacy_resolve(mapping, environ):
+    uri = PurePosixPath(environ.get('PATH_INFO', '/'))
+    for current in (uri, *uri.parents):
+        if (script := mapping.get(str(current))) is not None:
+            if current.parents:
+                environ['SCRIPT_NAME'] += str(current)
+            if current != uri:
+                environ['PATH_INFO'] = f'/{uri.relative_to(current)}'
+            else:
+                environ['PATH_INFO'] = '/'
+            return script
+    raise HTTPError(404)
+
+
+def build(mounts: int) -> Mapping:
+    mapping = Mapping({'/': app})
+    for idx in range(mounts - 1):
+        mapping[f'/section{idx % 10}/app{idx}'] = app
+    return mapping
+
+
+def run(mounts: int, number: int = 100_000):
+    mapping = build(mounts)
+    paths = [
+        f'/section{idx % 10}/app{idx}/some/resource'
+        for idx in range(0, mounts - 1, max(1, mounts // 10))
+    ]
+
+    def legacy():
+        for path in paths:
+            legacy_resolve(mapping, {'SCRIPT_NAME': '', 'PATH_INFO': path})
+
+    def indexed():
+        for path in paths:
+            mapping.resolve({'SCRIPT_NAME': '', 'PATH_INFO': path})
+
+    def uncached():
+        for path in paths:
+            mapping._find(path)
+
+    loops = number // len(paths)
+    for name, func in (
+            ('legacy', legacy), ('indexed', indexed), ('no LRU', uncached)):
+        duration = timeit.timeit(func, number=loops)
+        print(f'{mounts:>5} mounts  {name:<8} '
+              f'{duration / (loops * len(paths)) * 1e9:8.0f} ns/resolve')
+
+
+if __name__ == '__main__':
+    for mounts in (10, 100, 1000):
+        run(mounts)
@@ -0,0 +1,32 @@
+"""Choice of a media type for a browser-like Accept header, computed
+or cached per header value.
+
+    python benchmarks/bench_negotiation.py
+"""
+import timeit
+from horseman.negotiation import Negotiator, parse_accept
+
+
+ACCEPT = (
+    'text/html,application/xhtml+xml,application/xml;q=0.9,'
+    'image/avif,image/webp,*/*;q=0.8'
+)
+OFFERS = ('application/json', 'text/html', 'text/plain')
+
+
+def run(label, function, number=100_000):
+    duration = timeit.timeit(function, number=number) / number
+    print(f'{label:<16} {duration * 1e6:6.2f} µs')
+
+
+if __name__ == '__main__':
+    negotiator = Negotiator(OFFERS)
+    assert negotiator.best(ACCEPT) == negotiator.negotiate(ACCEPT)
+
+    def uncached():
+        parse_accept.cache_clear()
+        return negotiator.best(ACCEPT)
+
+    run('parse and match', uncached, 20_000)
+    run('match', lambda: negotiator.best(ACCEPT))
+    run('cached', lambda: negotiator.negotiate(ACCEPT))
@@ -0,0 +1,40 @@
+"""Parsing of short and 1000-parameter query strings, against the
+former `parse_qs` based parsing, and with the memoization.
+
+    python benchmarks/bench_query.py
+"""
+import timeit
+import urllib.parse
+from horseman.datastructures import Query
+
+
+SHORT = 'page=2&size=20&sort=name'
+LONG = '&'.join(
+    f'field{i}=value%20{i}&tag=t{i % 10}' for i in range(500))
+
+
+def legacy(value: str) -> Query:
+    return Query(
+        (key, tuple(values)) for key, values in urllib.parse.parse_qs(
+            value,
+            keep_blank_values=True,
+            strict_parsing=True,
+            errors='replace',
+        ).items())
+
+
+def run(label, value, number):
+    assert legacy(value) == Query.from_string(value)
+    print(f'{label} ({value.count("&") + 1} parameters)')
+    for name, parse in (
+            ('parse_qs', legacy),
+            ('from_string', Query.from_string),
+            ('from_cache', Query.from_cache)):
+        duration = timeit.timeit(
+            lambda: parse(value), number=number) / number
+        print(f'  {name:<12} {duration * 1e6:9.2f} µs')
+
+
+if __name__ == '__main__':
+    run('short', SHORT, 100_000)
+    run('long', LONG, 1_000)
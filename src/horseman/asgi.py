@@ -0,0 +1,331 @@
+import io
+import sys
+import asyncio
+import typing as t
+from concurrent.futures import Executor, ThreadPoolExecutor
+from http import HTTPStatus
+from tempfile import SpooledTemporaryFile
+from horseman.exceptions import HTTPError
+from horseman.response import Response
+from horseman.types import (
+    WSGICallable, Environ, ExceptionInfo, Scope, Receive, Send)
+
+
+def _native(value: str) -> str:
+    # Native strings hold the UTF-8 bytes as latin-1, as per PEP 3333.
+    return value.encode('utf-8').decode('latin-1')
+
+
+def _path_info(scope: Scope) -> str:
+    path = scope.get('path', '/')
+    root_path = scope.get('root_path', '')
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    return _native(path)
+
+
+def _server_port(scope: Scope) -> str:
+    if (server := scope.get('server')) and server[1] is not None:
+        return str(server[1])
+    return '443' if scope.get('scheme') == 'https' else '80'
+
+
+SCOPE_KEYS: t.Mapping[str, t.Callable[[Scope], t.Any]] = {
+    'REQUEST_METHOD': lambda scope: scope['method'],
+    'SCRIPT_NAME': lambda scope: _native(scope.get('root_path', '')),
+    'PATH_INFO': _path_info,
+    'QUERY_STRING': lambda scope: scope.get(
+        'query_string', b'').decode('latin-1'),
+    'SERVER_NAME': lambda scope: (scope.get('server') or ('localhost',))[0],
+    'SERVER_PORT': _server_port,
+    'SERVER_PROTOCOL': lambda scope: 'HTTP/' + scope.get(
+        'http_version', '1.1'),
+    'REMOTE_ADDR': lambda scope: (scope.get('client') or ('',))[0],
+    'wsgi.url_scheme': lambda scope: scope.get('scheme', 'http'),
+}
+
+
+def content_length(scope: Scope) -> t.Optional[int]:
+    """Returns the declared Content-Length of an ASGI request, looked
+    up in its headers without converting them.
+    """
+    for name, value in scope.get('headers', ()):
+        if name.lower() == b'content-length':
+            try:
+                return int(value)
+            except ValueError:
+                raise HTTPError(
+                    HTTPStatus.BAD_REQUEST, 'Invalid Content-Length.')
+    return None
+
+
+def header_keys(headers: t.Iterable[t.Tuple[bytes, bytes]]
+                ) -> t.Dict[str, str]:
+    """Returns the environ keys of the ASGI headers. Repeated headers
+    are joined, as a server would do.
+    """
+    keys: t.Dict[str, str] = {}
+    for name, value in headers:
+        key = name.decode('latin-1').upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = f'HTTP_{key}'
+        value = value.decode('latin-1')
+        if key in keys:
+            separator = '; ' if key == 'HTTP_COOKIE' else ','
+            keys[key] = f'{keys[key]}{separator}{value}'
+        else:
+            keys[key] = value
+    return keys
+
+
+class BodyStream(io.RawIOBase):
+    """Body of an ASGI request, received from `receive`.
+
+    `receive_all` awaits the whole body, writing it in a temporary
+    file kept in memory until it exceeds `SPOOL_THRESHOLD` bytes.
+    Past that threshold, the writes go to disk: they are done in an
+    executor, not to block the event loop.
+    It can then be read synchronously, as `wsgi.input`.
+    Bodies larger than `max_size` are rejected with a 413, before
+    receiving when the length is declared, while receiving otherwise.
+    """
+
+    SPOOL_THRESHOLD: t.ClassVar[int] = 1024 * 1024
+
+    def __init__(self, receive: Receive,
+                 length: t.Optional[int] = None,
+                 max_size: t.Optional[int] = None):
+        if max_size is not None and length is not None \
+           and length > max_size:
+            raise HTTPError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f'Body exceeds {max_size} bytes.'
+            )
+        self._receive = receive
+        self._spool: t.Optional[t.BinaryIO] = None
+        self.max_size = max_size
+        self.received = 0
+        self.complete = False
+        self.disconnected = False
+
+    def readable(self) -> bool:
+        return True
+
+    async def receive_all(self, executor: t.Optional[Executor] = None):
+        loop = asyncio.get_running_loop()
+        if self._spool is None:
+            self._spool = SpooledTemporaryFile(
+                max_size=self.SPOOL_THRESHOLD)
+        while not self.complete:
+            message = await self._receive()
+            if message['type'] == 'http.disconnect':
+                self.complete = self.disconnected = True
+                break
+            if (chunk := message.get('body', b'')):
+                self.received += len(chunk)
+                if self.max_size is not None and \
+                   self.received > self.max_size:
+                    raise HTTPError(
+                        HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                        f'Body exceeds {self.max_size} bytes.'
+                    )
+                if self.received <= self.SPOOL_THRESHOLD:
+                    self._spool.write(chunk)  # in memory.
+                else:
+                    await loop.run_in_executor(
+                        executor, self._spool.write, chunk)
+            if not message.get('more_body', False):
+                self.complete = True
+        self._spool.seek(0)
+
+    def readinto(self, buffer) -> int:
+        if self._spool is None:
+            raise RuntimeError('The body was not received.')
+        return self._spool.readinto(buffer)
+
+    def close(self):
+        if self._spool is not None:
+            self._spool.close()
+        super().close()
+
+
+class ASGIEnviron(Environ):
+    """WSGI environ of an ASGI request, built lazily from its scope.
+    Each key is computed when first looked up; the headers are
+    converted all at once, when one of them is.
+    """
+
+    __slots__ = ('scope', '_environ', '_pending', '_headers_pending')
+
+    def __init__(self, scope: Scope, body: t.BinaryIO):
+        self.scope = scope
+        self._environ: Environ = {
+            'wsgi.version': (1, 0),
+            'wsgi.input': body,
+            'wsgi.input_terminated': True,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+            'asgi.scope': scope,
+        }
+        self._pending = set(SCOPE_KEYS)
+        self._headers_pending = True
+
+    def _load(self, key: str):
+        if key in self._pending:
+            self._pending.discard(key)
+            self._environ[key] = SCOPE_KEYS[key](self.scope)
+        elif self._headers_pending and (
+                key[:5] == 'HTTP_' or
+                key in ('CONTENT_TYPE', 'CONTENT_LENGTH')):
+            self._load_headers()
+
+    def _load_headers(self):
+        self._headers_pending = False
+        self._environ.update(header_keys(self.scope.get('headers', ())))
+
+    def _load_all(self):
+        for key in tuple(self._pending):
+            self._load(key)
+        if self._headers_pending:
+            self._load_headers()
+
+    def __getitem__(self, key: str) -> t.Any:
+        self._load(key)
+        return self._environ[key]
+
+    def __setitem__(self, key: str, value: t.Any):
+        self._load(key)
+        self._environ[key] = value
+
+    def __delitem__(self, key: str):
+        self._load(key)
+        del self._environ[key]
+
+    def __iter__(self) -> t.Iterator[str]:
+        self._load_all()
+        return iter(self._environ)
+
+    def __len__(self) -> int:
+        self._load_all()
+        return len(self._environ)
+
+    def __repr__(self) -> str:
+        return f'<ASGIEnviron {self.scope.get("path")!r}>'
+
+
+class ASGIAdapter:
+    """ASGI application serving `app`: a `RootNode`, a `Response` or
+    any WSGI callable.
+
+    The request body is received asynchronously before `app` is
+    called, so that slow uploads do not hold a thread. `app` is then
+    called in `executor`, by default a pool of `max_workers` threads,
+    as is the iteration of its response, sent chunk by chunk.
+    Bodies larger than `max_body_size` are answered with a 413.
+
+    Unlike a WSGI server, the adapter buffers the whole body before
+    calling `app`: in memory up to `BodyStream.SPOOL_THRESHOLD` bytes,
+    on disk beyond. `app` can't start reading, or answering, before
+    the upload is complete; `max_body_size` bounds what is stored.
+    """
+
+    def __init__(self,
+                 app: WSGICallable,
+                 max_workers: t.Optional[int] = None,
+                 executor: t.Optional[Executor] = None,
+                 max_body_size: t.Optional[int] = None):
+        self.app = app
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='horseman')
+        self.max_body_size = max_body_size
+
+    async def lifespan(self, receive: Receive, send: Send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def respond(self, app: WSGICallable, environ: Environ,
+                      send: Send):
+        loop = asyncio.get_running_loop()
+        captured: t.List[t.Any] = []
+        written: t.List[bytes] = []
+        started = False
+
+        def start_response(status: str,
+                           headers: t.List[t.Tuple[str, str]],
+                           exc_info: t.Optional[ExceptionInfo] = None):
+            if exc_info is not None and started:
+                raise exc_info[1].with_traceback(exc_info[2])
+            captured[:] = [status, headers]
+            return written.append
+
+        async def send_body(chunk: bytes):
+            nonlocal started
+            if not started:
+                if not captured:
+                    raise RuntimeError('start_response was never called.')
+                status, headers = captured
+                started = True
+                await send({
+                    'type': 'http.response.start',
+                    'status': int(status.split(None, 1)[0]),
+                    'headers': [
+                        (name.encode('latin-1'), value.encode('latin-1'))
+                        for name, value in headers
+                    ]
+                })
+            if chunk:
+                await send({
+                    'type': 'http.response.body',
+                    'body': chunk,
+                    'more_body': True
+                })
+
+        iterable = await loop.run_in_executor(
+            self.executor, app, environ, start_response)
+        try:
+            chunks = iter(iterable)
+            while (chunk := await loop.run_in_executor(
+                    self.executor, next, chunks, None)) is not None:
+                for data in written:
+                    await send_body(data)
+                written.clear()
+                if chunk:
+                    await send_body(chunk)
+            for data in written:
+                await send_body(data)
+            await send_body(b'')
+            await send({'type': 'http.response.body', 'more_body': False})
+        finally:
+            if (closer := getattr(iterable, 'close', None)) is not None:
+                await loop.run_in_executor(self.executor, closer)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] != 'http':
+            raise ValueError(f"Unsupported scope type {scope['type']!r}.")
+
+        environ = ASGIEnviron(scope, None)
+        try:
+            app = self.app
+            try:
+                body = BodyStream(
+                    receive, content_length(scope), self.max_body_size)
+                environ['wsgi.input'] = body
+                await body.receive_all(self.executor)
+            except HTTPError as exc:
+                app = Response(exc.status, body=exc.body)
+            else:
+                if body.disconnected:
+                    return
+            await self.respond(app, environ, send)
+        finally:
+            if (body := environ['wsgi.input']) is not None:
+                body.close()
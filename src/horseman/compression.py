@@ -0,0 +1,248 @@
+import zlib
+import typing as t
+from itertools import chain
+from functools import lru_cache
+from http import HTTPStatus
+from horseman.response import BODYLESS
+from horseman.types import (
+    WSGICallable, Environ, StartResponse, ExceptionInfo)
+
+
+WBITS: t.Mapping[str, int] = {
+    'gzip': 16 + zlib.MAX_WBITS,  # gzip container.
+    'deflate': zlib.MAX_WBITS,  # zlib container, as per RFC 9110.
+}
+
+INCOMPRESSIBLE_TYPES = frozenset((
+    'application/gzip',
+    'application/x-gzip',
+    'application/zip',
+    'application/x-bzip2',
+    'application/x-xz',
+    'application/x-7z-compressed',
+    'application/x-rar-compressed',
+    'application/zstd',
+    'application/pdf',
+    'font/woff',
+    'font/woff2',
+))
+
+
+def compressible(content_type: t.Optional[str]) -> bool:
+    """Returns False for content types that are already compressed.
+    """
+    if not content_type:
+        return True
+    mimetype = content_type.split(';', 1)[0].strip().lower()
+    if mimetype in INCOMPRESSIBLE_TYPES:
+        return False
+    maintype = mimetype.split('/', 1)[0]
+    if maintype in ('image', 'audio', 'video'):
+        return mimetype == 'image/svg+xml'
+    return True
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str,
+              available: t.Tuple[str, ...] = ('gzip', 'deflate')
+              ) -> t.Optional[str]:
+    """Returns the preferred encoding among `available`, according to
+    the q-values of the Accept-Encoding header, or None. Ties are
+    broken by the order of `available`.
+    """
+    qualities: t.Dict[str, float] = {}
+    for coding in accept_encoding.split(','):
+        name, _, params = coding.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params[:2].lower() == 'q=':
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name] = quality
+
+    wildcard = qualities.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class Compression:
+    """WSGI layer compressing the responses of `app` with gzip or
+    deflate, as negotiated with the Accept-Encoding header.
+
+    It can wrap a `Response`, a `RootNode` or any WSGI callable.
+    The body is read until `min_size` bytes are gathered, plus one
+    chunk. A complete body is compressed in one shot, with a fixed
+    Content-Length.
+    Compressed outputs of bodies up to `cache_max_size` bytes are kept
+    in a LRU of `cache_size` entries, for static bodies. Larger bodies
+    are compressed incrementally. Smaller bodies, already encoded
+    bodies and incompressible content types are left untouched.
+    """
+
+    available: t.Tuple[str, ...] = ('gzip', 'deflate')
+
+    def __init__(self,
+                 app: WSGICallable,
+                 min_size: int = 500,
+                 level: int = 6,
+                 cache_size: int = 128,
+                 cache_max_size: int = 262144):
+        self.app = app
+        self.min_size = min_size
+        self.level = level
+        self.cache_max_size = cache_max_size
+        self._compress = lru_cache(maxsize=cache_size)(self.compress)
+
+    def compress(self, encoding: str, payload: bytes) -> bytes:
+        compressor = zlib.compressobj(
+            self.level, zlib.DEFLATED, WBITS[encoding])
+        return compressor.compress(payload) + compressor.flush()
+
+    def compress_stream(self, encoding: str,
+                        chunks: t.Iterable[bytes]) -> t.Iterator[bytes]:
+        compressor = zlib.compressobj(
+            self.level, zlib.DEFLATED, WBITS[encoding])
+        for chunk in chunks:
+            if (data := compressor.compress(chunk)):
+                yield data
+        yield compressor.flush()
+
+    @staticmethod
+    def eligible(status: str, headers: t.List[t.Tuple[str, str]]) -> bool:
+        code = int(status.split(None, 1)[0])
+        if code in BODYLESS or code == HTTPStatus.PARTIAL_CONTENT:
+            return False
+        for name, value in headers:
+            name = name.lower()
+            if name in ('content-encoding', 'content-range'):
+                return False
+            if name == 'content-type' and not compressible(value):
+                return False
+            if name == 'cache-control' and 'no-transform' in value.lower():
+                return False
+        return True
+
+    @staticmethod
+    def rewrite(headers: t.List[t.Tuple[str, str]],
+                encoding: t.Optional[str],
+                length: t.Optional[int]) -> t.List[t.Tuple[str, str]]:
+        result = []
+        vary = False
+        for name, value in headers:
+            lowered = name.lower()
+            if lowered == 'vary':
+                vary = True
+                tokens = {token.strip().lower() for token in value.split(',')}
+                if not tokens & {'*', 'accept-encoding'}:
+                    value = f'{value}, Accept-Encoding'
+            elif lowered == 'content-length' and encoding is not None:
+                continue
+            result.append((name, value))
+        if not vary:
+            result.append(('Vary', 'Accept-Encoding'))
+        if encoding is not None:
+            result.append(('Content-Encoding', encoding))
+            if length is not None:
+                result.append(('Content-Length', str(length)))
+        return result
+
+    def __call__(self, environ: Environ,
+                 start_response: StartResponse) -> t.Iterable[bytes]:
+        """Responses left untouched, known as soon as `start_response`
+        was called, get the iterable of `app` as is: it may be a
+        `wsgi.file_wrapper`. Only the compressing paths and the
+        applications starting the response lazily are iterated here.
+        """
+        encoding = negotiate(
+            environ.get('HTTP_ACCEPT_ENCODING', ''), self.available)
+        captured: t.List[t.Any] = []
+        sent = False
+
+        def capture(status: str,
+                    headers: t.List[t.Tuple[str, str]],
+                    exc_info: t.Optional[ExceptionInfo] = None):
+            if sent:
+                return start_response(status, headers, exc_info)
+            captured[:] = [status, headers, exc_info]
+
+        def send(headers: t.List[t.Tuple[str, str]]):
+            nonlocal sent
+            status, _, exc_info = captured
+            sent = True
+            start_response(status, headers, exc_info)
+
+        def untouched(headers: t.List[t.Tuple[str, str]]
+                      ) -> t.Optional[t.List[t.Tuple[str, str]]]:
+            # The headers to send if the body is not compressed.
+            if not self.eligible(captured[0], headers):
+                return headers
+            if encoding is None:
+                return self.rewrite(headers, None, None)
+            return None
+
+        def buffered_response() -> t.Iterator[bytes]:
+            try:
+                chunks = iter(iterable)
+                buffered: t.List[bytes] = []
+                size = 0
+                exhausted = peeked = False
+                while True:
+                    try:
+                        chunk = next(chunks)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    buffered.append(chunk)
+                    if peeked:
+                        break
+                    size += len(chunk)
+                    if captured and size >= self.min_size:
+                        # One more chunk tells if the body is complete.
+                        peeked = True
+
+                if not captured:
+                    raise RuntimeError('start_response was never called.')
+                status, headers, _ = captured
+                if (plain := untouched(headers)) is not None:
+                    send(plain)
+                    yield from chain(buffered, chunks)
+                elif exhausted and size < self.min_size:
+                    send(self.rewrite(headers, None, None))
+                    yield from buffered
+                elif exhausted:
+                    payload = b''.join(buffered)
+                    if len(payload) <= self.cache_max_size:
+                        body = self._compress(encoding, payload)
+                    else:
+                        body = self.compress(encoding, payload)
+                    send(self.rewrite(headers, encoding, len(body)))
+                    yield body
+                else:
+                    send(self.rewrite(headers, encoding, None))
+                    yield from self.compress_stream(
+                        encoding, chain(buffered, chunks))
+            finally:
+                if (closer := getattr(iterable, 'close', None)) is not None:
+                    closer()
+
+        iterable = self.app(environ, capture)
+        if captured:
+            try:
+                plain = untouched(captured[1])
+                if plain is not None:
+                    send(plain)
+                    return iterable
+            except BaseException:
+                if (closer := getattr(iterable, 'close', None)) is not None:
+                    closer()
+                raise
+        return buffered_response()
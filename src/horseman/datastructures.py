@@ -1,35 +1,170 @@
 import typing as t
 import urllib.parse
+from functools import lru_cache
 from biscuits import Cookie, parse
 from frozendict import frozendict
 from horseman.types import MIMEType
 from horseman.utils import parse_header
 
 
+class MultiValues:
+    """Typed accessors of the first value of a key, for containers
+    where `self[key]` is the sequence of values of `key`.
+    """
+
+    __slots__ = ()
+
+    TRUE_STRINGS = {'t', 'true', 'yes', '1', 'on'}
+    FALSE_STRINGS = {'f', 'false', 'no', '0', 'off'}
+    NONE_STRINGS = {'n', 'none', 'null'}
+
+    def as_bool(self, key: str) -> t.Optional[bool]:
+        value = self[key][0]
+        if value in (True, False, None):
+            return value
+        value = value.lower()
+        if value in self.TRUE_STRINGS:
+            return True
+        elif value in self.FALSE_STRINGS:
+            return False
+        elif value in self.NONE_STRINGS:
+            return None
+        raise ValueError(f"Can't cast {value!r} to boolean.")
+
+    def as_int(self, key: str) -> int:
+        return int(self[key][0])
+
+    def as_float(self, key: str) -> float:
+        return float(self[key][0])
+
+
+class Form(MultiValues, t.Sequence[t.Tuple[str, t.Any]]):
+    """Read-only form data: a sequence of `(name, value)` pairs, in
+    the order of the body, that can be looked up by name.
+
+    Names and values are stored in parallel tuples. The positions of
+    each name are indexed once, at creation. As in `Query`, `get`
+    returns the first value of a name and `form[name]` all of them.
+    Forms with more than `MAX_NUM_FIELDS` fields are rejected by the
+    parsers with a 413.
+    """
+
+    MAX_NUM_FIELDS: t.ClassVar[t.Optional[int]] = None
+
+    __slots__ = ('_names', '_values', '_index')
+
+    _names: t.Tuple[str, ...]
+    _values: t.Tuple[t.Any, ...]
+    _index: t.Dict[str, t.List[int]]
+
+    def __init__(self, pairs: t.Iterable[t.Tuple[str, t.Any]] = ()):
+        names, values = [], []
+        index: t.Dict[str, t.List[int]] = {}
+        for position, (name, value) in enumerate(pairs):
+            names.append(name)
+            values.append(value)
+            index.setdefault(name, []).append(position)
+        self._names = tuple(names)
+        self._values = tuple(values)
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> t.Iterator[t.Tuple[str, t.Any]]:
+        return zip(self._names, self._values)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple(self._values[i] for i in self._index[key])
+        if isinstance(key, slice):
+            return list(zip(self._names[key], self._values[key]))
+        return self._names[key], self._values[key]
+
+    def __contains__(self, item) -> bool:
+        if isinstance(item, str):
+            return item in self._index
+        return item in list(self)
+
+    def __eq__(self, other: t.Any) -> bool:
+        if isinstance(other, Form):
+            return self._names == other._names and \
+                self._values == other._values
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({list(self)!r})'
+
+    def names(self) -> t.KeysView[str]:
+        """The distinct names, in order of first appearance. This is
+        not `keys()`: `dict(form)` keeps building from the pairs.
+        """
+        return self._index.keys()
+
+    def get(self, name: str, default=None):
+        """Return the first value of the name.
+        """
+        if (positions := self._index.get(name)) is None:
+            return default
+        return self._values[positions[0]]
+
+    def getlist(self, name: str) -> t.Sequence[t.Any]:
+        """Return the values of the name.
+        """
+        return tuple(self._values[i] for i in self._index.get(name, ()))
+
+
 class Data(t.NamedTuple):
-    form: t.Optional[t.Iterable[t.Tuple[str, t.Any]]] = None
-    json: t.Optional[t.Union[t.Dict, t.List]] = None  # not too specific
+    form: t.Optional[Form] = None
+    json: t.Optional[
+        t.Union[t.Dict, t.List, t.Iterator]] = None  # not too specific
 
 
 class ContentType(str):
+    """A parsed Content-Type like header, normalized.
+
+    Instances are immutable, attributes included: they are interned,
+    per header value, in a LRU of `cache_size` entries, so that the
+    recurring values are parsed once, and shared across requests.
+    """
+
     __slots__ = ('mimetype', 'options')
 
+    cache_size: t.ClassVar[int] = 256
+
     mimetype: MIMEType
     options: t.Mapping[str, str]
 
     def __new__(cls, value: str):
         if isinstance(value, cls):
             return value
+        if (intern := cls.__dict__.get('_intern')) is None:
+            # One LRU per class, as subclasses parse differently.
+            intern = lru_cache(maxsize=cls.cache_size)(cls.create)
+            cls._intern = intern
+        return intern(value)
 
+    @classmethod
+    def create(cls, value: str):
         mimetype, params = parse_header(value)
         instance = str.__new__(
             cls, mimetype + "".join(
                 f"; {k}={v}" for k, v in sorted(params.items())))
 
-        instance.mimetype = mimetype
-        instance.options = frozendict(params)
+        object.__setattr__(instance, 'mimetype', mimetype)
+        object.__setattr__(instance, 'options', frozendict(params))
         return instance
 
+    def __setattr__(self, name: str, value: t.Any):
+        raise AttributeError(f'{self.__class__.__name__} is immutable.')
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f'{self.__class__.__name__} is immutable.')
+
 
 class MediaType(ContentType):
     __slots__ = ('options', 'mimetype', 'maintype', 'subtype')
@@ -39,10 +174,8 @@ class MediaType(ContentType):
     subtype: t.Optional[str]
     options: t.Mapping[str, str]
 
-    def __new__(cls, value: str):
-        if isinstance(value, cls):
-            return value
-
+    @classmethod
+    def create(cls, value: str):
         mimetype, params = parse_header(value)
 
         if mimetype == '*':
@@ -61,12 +194,35 @@ class MediaType(ContentType):
             cls, mimetype + "".join(
                 f"; {k}={v}" for k, v in sorted(params.items())))
 
-        instance.mimetype = mimetype
-        instance.maintype = maintype
-        instance.subtype = subtype
-        instance.options = frozendict(params)
+        for name, value in (
+                ('mimetype', mimetype),
+                ('maintype', maintype),
+                ('subtype', subtype),
+                ('options', frozendict(params))):
+            object.__setattr__(instance, name, value)
         return instance
 
+    @property
+    def quality(self) -> float:
+        """The q-value of a media range, 0 if invalid.
+        """
+        try:
+            quality = float(self.options.get('q', 1))
+        except ValueError:
+            return 0.0
+        return quality if 0 <= quality <= 1 else 0.0
+
+    @property
+    def specificity(self) -> int:
+        """Precedence of a media range: `*/*`, `type/*`, `type/subtype`,
+        then `type/subtype` with parameters, `q` excluded.
+        """
+        if self.maintype == '*':
+            return 0
+        if self.subtype == '*':
+            return 1
+        return 2 + len(self.options.keys() - {'q'})
+
     def match(self, other: str) -> bool:
         other_media_type = MediaType(other)
         return self.maintype in {'*', other_media_type.maintype} and \
@@ -84,11 +240,85 @@ class Cookies(t.Dict[str, Cookie]):
         return parse(value)
 
 
-class Query(frozendict[str, t.Sequence[str]]):
+class RequestCookies(t.Mapping[str, str]):
+    """Read-only view of the cookies of a `Cookie` header.
 
-    TRUE_STRINGS = {'t', 'true', 'yes', '1', 'on'}
-    FALSE_STRINGS = {'f', 'false', 'no', '0', 'off'}
-    NONE_STRINGS = {'n', 'none', 'null'}
+    Looking up a cookie scans the raw header for its name and only
+    parses the matching pair. The whole header is parsed once, on
+    iteration, or when it holds quoted or escaped values, which can
+    contain separators.
+    """
+
+    __slots__ = ('header', '_cookies')
+
+    _cookies: t.Optional[t.Dict[str, str]]
+
+    def __init__(self, header: str = ''):
+        self.header = header
+        self._cookies = None
+
+    @property
+    def cookies(self) -> t.Dict[str, str]:
+        if self._cookies is None:
+            self._cookies = parse(self.header)
+        return self._cookies
+
+    def pairs(self, name: str) -> t.Iterator[str]:
+        """Yields the raw `name=value` pairs of the cookie, from the
+        last to the first.
+        """
+        header = self.header
+        size = len(header)
+        end = size
+        while name and (position := header.rfind(name, 0, end)) >= 0:
+            end = position
+            before = position - 1
+            while before >= 0 and header[before] == ' ':
+                before -= 1
+            if before >= 0 and header[before] not in ';,':
+                continue
+            after = position + len(name)
+            while after < size and header[after] == ' ':
+                after += 1
+            if after < size and header[after] == '=':
+                if (stop := header.find(';', after)) < 0:
+                    stop = size
+                if (comma := header.find(',', after, stop)) >= 0:
+                    stop = comma
+                yield header[position:stop]
+
+    def __getitem__(self, name: str) -> str:
+        if self._cookies is not None or \
+           '"' in self.header or '\\' in self.header:
+            return self.cookies[name]
+        for pair in self.pairs(name):
+            # The last valid pair wins, as when parsing the whole header.
+            if (value := parse(pair).get(name)) is not None:
+                return value
+        raise KeyError(name)
+
+    def __iter__(self) -> t.Iterator[str]:
+        return iter(self.cookies)
+
+    def __len__(self) -> int:
+        return len(self.cookies)
+
+    def __repr__(self) -> str:
+        return f'<RequestCookies {self.header!r}>'
+
+
+class Query(MultiValues, frozendict[str, t.Sequence[str]]):
+    """Immutable query parameters, mapping each name to the tuple of
+    its values.
+
+    The query string is parsed in a single pass, straight into the
+    final index. Query strings up to `CACHE_MAX_LENGTH` characters
+    can be memoized, in a LRU of `cache_size` entries, with
+    `from_cache`: as queries are immutable, they can be shared.
+    """
+
+    cache_size: t.ClassVar[int] = 256
+    CACHE_MAX_LENGTH: t.ClassVar[int] = 1024
 
     def get(self, name: str, default=None):
         """Return the first value of the found list.
@@ -100,25 +330,6 @@ class Query(frozendict[str, t.Sequence[str]]):
         """
         return super().get(name, [])
 
-    def as_bool(self, key: str) -> t.Optional[bool]:
-        value = self[key][0]
-        if value in (True, False, None):
-            return value
-        value = value.lower()
-        if value in self.TRUE_STRINGS:
-            return True
-        elif value in self.FALSE_STRINGS:
-            return False
-        elif value in self.NONE_STRINGS:
-            return None
-        raise ValueError(f"Can't cast {value!r} to boolean.")
-
-    def as_int(self, key: str) -> int:
-        return int(self[key][0])
-
-    def as_float(self, key: str) -> float:
-        return float(self[key][0])
-
     @classmethod
     def from_string(
             cls,
@@ -130,15 +341,58 @@ class Query(frozendict[str, t.Sequence[str]]):
             max_num_fields: int = None,
             separator: str = '&'
     ):
+        """Parses `value` as `urllib.parse.parse_qs` would.
+        """
         if not value:
             return cls()
-        return cls(
-            (key, tuple(l)) for key, l in urllib.parse.parse_qs(
-                value,
-                keep_blank_values=keep_blank_values,
-                strict_parsing=strict_parsing,
-                encoding=encoding,
-                errors=errors,
-                max_num_fields=max_num_fields,
-                separator=separator,
-            ).items())
+        if max_num_fields is not None and \
+           value.count(separator) + 1 > max_num_fields:
+            raise ValueError('Max number of fields exceeded')
+
+        unquote = urllib.parse.unquote
+        index: t.Dict[str, t.Any] = {}
+        repeated = False
+        for field in value.split(separator):
+            if not field and not strict_parsing:
+                continue
+            name, equal, item = field.partition('=')
+            if not equal:
+                if strict_parsing:
+                    raise ValueError(f'bad query field: {field!r}')
+                if not keep_blank_values:
+                    continue
+            elif not item and not keep_blank_values:
+                continue
+            if '+' in name:
+                name = name.replace('+', ' ')
+            if '%' in name:
+                name = unquote(name, encoding, errors)
+            if '+' in item:
+                item = item.replace('+', ' ')
+            if '%' in item:
+                item = unquote(item, encoding, errors)
+
+            if (values := index.get(name)) is None:
+                index[name] = (item,)
+            elif type(values) is tuple:
+                index[name] = [*values, item]
+                repeated = True
+            else:
+                values.append(item)
+
+        if repeated:
+            for name, values in index.items():
+                if type(values) is list:
+                    index[name] = tuple(values)
+        return cls(index)
+
+    @classmethod
+    def from_cache(cls, value: str) -> 'Query':
+        """Memoized `from_string`, with the default parameters.
+        """
+        if len(value) > cls.CACHE_MAX_LENGTH:
+            return cls.from_string(value)
+        if (cache := cls.__dict__.get('_cache')) is None:
+            cache = lru_cache(maxsize=cls.cache_size)(cls.from_string)
+            cls._cache = cache
+        return cache(value)
@@ -1,11 +1,16 @@
 import typing as t
 import urllib.parse
+from datetime import datetime
 from pathlib import PurePosixPath
 from collections.abc import Mapping
 from functools import cached_property
 from horseman.types import Environ
+from horseman.utils import parse_etags, parse_http_date
 from horseman.parsers import Data, parser
-from horseman.datastructures import Cookies, ContentType, Query
+from horseman.streams import InputStream, ReplayableStream
+from horseman.datastructures import (
+    ContentType, MediaType, Query, RequestCookies)
+from horseman.negotiation import parse_accept
 
 
 class immutable_cached_property(cached_property):
@@ -19,8 +24,14 @@ class immutable_cached_property(cached_property):
 
 class WSGIEnvironWrapper(Environ):
 
+    # Bodies larger than this are rejected with a 413 when read.
+    max_body_size: t.ClassVar[t.Optional[int]] = None
+
+    # Records the body, so that it can be read again after parsing.
+    record_body: t.ClassVar[bool] = True
+
     def __init__(self, environ: Environ):
-        if isinstance(environ, WSGIEnvironWrapper):
+        if isinstance(environ, (WSGIEnvironWrapper, Request)):
             raise TypeError(
                 f'{self.__class__!r} cannot wrap a subclass of itself.')
         self._environ: Environ = environ
@@ -60,13 +71,33 @@ class WSGIEnvironWrapper(Environ):
 
     @immutable_cached_property
     def body(self) -> t.BinaryIO:
-        return self._environ['wsgi.input']
+        """The body, bounded by the Content-Length. It is stored in the
+        environ, to be shared by all the wrappers of the request.
+        If `record_body` is true, it is a `ReplayableStream`, recording
+        what is read from `wsgi.input` so that it can be rewound.
+        """
+        if (body := self._environ.get('horseman.body')) is None:
+            body = InputStream.from_environ(
+                self._environ, self.max_body_size)
+            if self.record_body:
+                body = ReplayableStream(body)
+            self._environ['horseman.body'] = body
+        return body
 
     @immutable_cached_property
     def data(self) -> Data:
+        """The parsed body. A recorded body is parsed from its start,
+        then rewound, so that it can still be read afterwards.
+        """
         if self.content_type:
-            return parser.parse(
-                self._environ['wsgi.input'], self.content_type)
+            body = self.body
+            if not body.seekable():
+                return parser.parse(body, self.content_type)
+            body.seek(0)
+            try:
+                return parser.parse(body, self.content_type)
+            finally:
+                body.seek(0)
         return Data()
 
     @immutable_cached_property
@@ -94,16 +125,30 @@ class WSGIEnvironWrapper(Environ):
 
     @immutable_cached_property
     def query(self) -> Query:
-        return Query.from_string(self._environ.get('QUERY_STRING', ''))
+        return Query.from_cache(self._environ.get('QUERY_STRING', ''))
 
     @immutable_cached_property
-    def cookies(self) -> Cookies:
-        return Cookies.from_string(self._environ.get('HTTP_COOKIE', ''))
+    def cookies(self) -> RequestCookies:
+        return RequestCookies(self._environ.get('HTTP_COOKIE', ''))
 
     @immutable_cached_property
     def content_type(self) -> ContentType:
         return ContentType(self._environ.get('CONTENT_TYPE', ''))
 
+    @immutable_cached_property
+    def accept(self) -> t.Tuple[MediaType, ...]:
+        return parse_accept(self._environ.get('HTTP_ACCEPT', ''))
+
+    @immutable_cached_property
+    def if_none_match(self) -> t.Tuple[str, ...]:
+        return parse_etags(self._environ.get('HTTP_IF_NONE_MATCH', ''))
+
+    @immutable_cached_property
+    def if_modified_since(self) -> t.Optional[datetime]:
+        if value := self._environ.get('HTTP_IF_MODIFIED_SINCE'):
+            return parse_http_date(value)
+        return None
+
     @immutable_cached_property
     def application_uri(self) -> str:
         scheme = self._environ.get('wsgi.url_scheme', 'http')
@@ -129,3 +174,81 @@ class WSGIEnvironWrapper(Environ):
             if qs:
                 return f"{self.application_uri}{path_info}?{qs}"
         return f"{self.application_uri}{path_info}"
+
+
+MISSING = object()
+
+
+class slot_cached_property:
+    """Immutable cached property of a slotted class, storing its value
+    in the slot `slot`. The slot is read first and the value only
+    computed when it is empty.
+    """
+
+    def __init__(self, func: t.Callable[[t.Any], t.Any], slot: str):
+        self.func = func
+        self.slot = slot
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if (value := getattr(instance, self.slot, MISSING)) is MISSING:
+            value = self.func(instance)
+            object.__setattr__(instance, self.slot, value)
+        return value
+
+    def __set__(self, instance, value):
+        raise AttributeError("can't set attribute")
+
+    def __delete__(self, instance):
+        object.__delattr__(instance, self.slot)
+
+
+class Request(Environ):
+    """`WSGIEnvironWrapper` without instance dict. Each of its
+    properties caches its value in a slot of the same name, prefixed
+    by an underscore. They can't be set, but can be deleted to be
+    recomputed. The lookups of the environ keys go straight to the
+    wrapped environ.
+    """
+
+    # Bodies larger than this are rejected with a 413 when read.
+    max_body_size: t.ClassVar[t.Optional[int]] = None
+
+    # Records the body, so that it can be read again after parsing.
+    record_body: t.ClassVar[bool] = True
+
+    # The cached properties of `WSGIEnvironWrapper`, by name.
+    properties: t.ClassVar[t.Mapping[str, t.Callable[[t.Any], t.Any]]] = {
+        name: value.func for name, value in vars(WSGIEnvironWrapper).items()
+        if isinstance(value, immutable_cached_property)
+    }
+
+    __slots__ = ('_environ', *(f'_{name}' for name in properties))
+
+    def __init__(self, environ: Environ):
+        # Plain dicts skip the costly check against the ABCs.
+        if type(environ) is not dict and \
+           isinstance(environ, (WSGIEnvironWrapper, Request)):
+            raise TypeError(
+                f'{self.__class__!r} cannot wrap a subclass of itself.')
+        self._environ = environ
+
+    __setitem__ = WSGIEnvironWrapper.__setitem__
+    __delitem__ = WSGIEnvironWrapper.__delitem__
+    __getitem__ = WSGIEnvironWrapper.__getitem__
+    __iter__ = WSGIEnvironWrapper.__iter__
+    __len__ = WSGIEnvironWrapper.__len__
+    __eq__ = WSGIEnvironWrapper.__eq__
+    uri = WSGIEnvironWrapper.uri
+
+    def __contains__(self, key: t.Any) -> bool:
+        return key in self._environ
+
+    def get(self, key: str, default: t.Any = None) -> t.Any:
+        return self._environ.get(key, default)
+
+
+for name, func in Request.properties.items():
+    setattr(Request, name, slot_cached_property(func, f'_{name}'))
@@ -3,6 +3,7 @@ import typing as t
 from pathlib import PurePosixPath
 from abc import ABC, abstractmethod
 from collections import UserDict
+from functools import lru_cache
 from horseman.exceptions import HTTPError
 from horseman.response import Response
 from horseman.types import (
@@ -26,43 +27,99 @@ class RootNode(Node):
         if isinstance(exc, HTTPError):
             return Response(exc.status, body=exc.body)
 
-    def __call__(self, environ: Environ, start_response: StartResponse):
-        iterable = None
+    def __call__(self, environ: Environ,
+                 start_response: StartResponse) -> t.Iterable[bytes]:
+        """The iterable of the resolved application is returned as is,
+        so that the server can close it and recognize a
+        `wsgi.file_wrapper`. Only the exceptions raised while resolving
+        and calling the application are handled: the ones raised while
+        iterating happen after the response has started.
+        """
         try:
-            iterable = self.resolve(environ)
-            yield from iterable(environ, start_response)
+            app = self.resolve(environ)
+            return app(environ, start_response)
         except Exception:
-            iterable = self.handle_exception(sys.exc_info(), environ)
-            if iterable is None:
+            response = self.handle_exception(sys.exc_info(), environ)
+            if response is None:
                 raise
-            yield from iterable(environ, start_response)
-        finally:
-            if iterable is not None:
-                closer: t.Optional[t.Callable[[], None]] = getattr(
-                    iterable, 'close', None
-                )
-                if closer is not None:
-                    try:
-                        closer()
-                    except Exception:
-                        self.handle_exception(sys.exc_info(), environ)
-                        raise
+            return response(environ, start_response)
 
 
 class Mapping(RootNode, UserDict, t.Mapping[str, WSGICallable]):
+    """Dispatches to the WSGI callable mounted on the longest prefix
+    of `PATH_INFO`.
+
+    The lengths of the mounted prefixes are indexed on each change,
+    so that the resolution only needs to test the positions of the
+    path where a mounted prefix could end. Resolutions are memoized
+    per `PATH_INFO` value, in a LRU of `cache_size` entries.
+    """
+
+    cache_size: t.ClassVar[int] = 256
+
+    _lengths: t.Tuple[int, ...]
+    _match: t.Callable[
+        [str], t.Optional[t.Tuple[WSGICallable, str, str]]]
+
+    def __init__(self, *args, **kwargs):
+        self.data = {}
+        self._reindex()
+        super().__init__(*args, **kwargs)
+
+    def __copy__(self):
+        inst = super().__copy__()
+        inst._reindex()  # the LRU is bound to the original instance.
+        return inst
 
     def __setitem__(self, path: str, script: WSGICallable):
         super().__setitem__(str('/' / PurePosixPath(path)), script)
+        self._reindex()
+
+    def __delitem__(self, path: str):
+        super().__delitem__(path)
+        self._reindex()
+
+    def _reindex(self):
+        self._lengths = tuple(sorted(
+            {len(path) for path in self.data if path != '/'},
+            reverse=True
+        ))
+        self._match = lru_cache(maxsize=self.cache_size)(self._find)
+
+    def _find(self, path_info: str) -> t.Optional[
+            t.Tuple[WSGICallable, str, str]]:
+        """Returns the script, the SCRIPT_NAME suffix and the new
+        PATH_INFO, or None if no mounted prefix matches.
+        """
+        if path_info[:1] != '/' or '//' in path_info or '/.' in path_info \
+           or (path_info[-1] == '/' and len(path_info) > 1):
+            # Not in a canonical form: normalize the same way the
+            # mounted prefixes were normalized.
+            path_info = str(PurePosixPath(path_info))
+            if path_info[:1] != '/' or path_info[:2] == '//':
+                return None
+
+        length = len(path_info)
+        for size in self._lengths:
+            if size < length:
+                if path_info[size] == '/':
+                    prefix = path_info[:size]
+                    if (script := self.data.get(prefix)) is not None:
+                        return script, prefix, path_info[size:]
+            elif size == length:
+                if (script := self.data.get(path_info)) is not None:
+                    return script, path_info, '/'
+
+        if (script := self.data.get('/')) is not None:
+            return script, '', path_info
+        return None
 
     def resolve(self, environ: Environ) -> WSGICallable:
-        uri = PurePosixPath(environ.get('PATH_INFO', '/'))
-        for current in (uri, *uri.parents):
-            if (script := self.get(str(current))) is not None:
-                if current.parents:
-                    environ['SCRIPT_NAME'] += str(current)
-                if current != uri:
-                    environ['PATH_INFO'] = f'/{uri.relative_to(current)}'
-                else:
-                    environ['PATH_INFO'] = '/'
-                return script
-        raise HTTPError(404)
+        found = self._match(environ.get('PATH_INFO', '/'))
+        if found is None:
+            raise HTTPError(404)
+        script, script_name, path_info = found
+        if script_name:
+            environ['SCRIPT_NAME'] += script_name
+        environ['PATH_INFO'] = path_info
+        return script
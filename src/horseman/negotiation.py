@@ -0,0 +1,149 @@
+import typing as t
+from functools import lru_cache
+from horseman.datastructures import MediaType
+
+
+@lru_cache(maxsize=256)
+def parse_accept(value: str) -> t.Tuple[MediaType, ...]:
+    """Returns the media ranges of an Accept header, by decreasing
+    quality, then specificity. Invalid ranges are ignored.
+    """
+    ranges = []
+    for item in value.split(','):
+        if not (item := item.strip()):
+            continue
+        try:
+            media = MediaType(item)
+        except ValueError:
+            continue
+        if media.subtype:
+            ranges.append(media)
+    ranges.sort(key=lambda media: (-media.quality, -media.specificity))
+    return tuple(ranges)
+
+
+def parse_quality_values(value: str) -> t.Tuple[t.Tuple[str, float], ...]:
+    """Returns the lowercased tokens of an `Accept-Language` or
+    `Accept-Charset` like header, with their q-value, by decreasing
+    q-value.
+    """
+    values = []
+    for item in value.split(','):
+        token, _, params = item.partition(';')
+        if not (token := token.strip().lower()):
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params[:2].lower() == 'q=':
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        values.append((token, quality if 0 <= quality <= 1 else 0.0))
+    values.sort(key=lambda value: -value[1])
+    return tuple(values)
+
+
+@lru_cache(maxsize=256)
+def negotiate_language(accept_language: str,
+                       available: t.Tuple[str, ...]) -> t.Optional[str]:
+    """Returns the preferred language tag among `available`, or None.
+    A language range matches the tags it is a prefix of, as per the
+    basic filtering of RFC 4647. Without header, the first available
+    tag is returned.
+    """
+    if not accept_language.strip():
+        return available[0] if available else None
+    for language, quality in parse_quality_values(accept_language):
+        if quality <= 0:
+            break
+        for tag in available:
+            lowered = tag.lower()
+            if language == '*' or lowered == language or \
+               lowered.startswith(f'{language}-'):
+                return tag
+    return None
+
+
+@lru_cache(maxsize=256)
+def negotiate_charset(accept_charset: str,
+                      available: t.Tuple[str, ...]) -> t.Optional[str]:
+    """Returns the preferred charset among `available`, or None.
+    Without header, the first available charset is returned.
+    """
+    if not accept_charset.strip():
+        return available[0] if available else None
+    qualities = dict(reversed(parse_quality_values(accept_charset)))
+    wildcard = qualities.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for charset in available:
+        quality = qualities.get(charset.lower(), wildcard)
+        if quality > best_quality:
+            best, best_quality = charset, quality
+    return best
+
+
+class Negotiator:
+    """Chooses the media type to produce, among `offers`, for an
+    Accept header.
+
+    The offers, in order of preference of the server, are parsed once
+    into a table. An offer gets the quality of the most specific media
+    range matching it; the best quality wins and ties are broken by
+    the order of the offers. Choices are cached per Accept header
+    value, in a LRU of `cache_size` entries.
+    """
+
+    cache_size: t.ClassVar[int] = 256
+
+    __slots__ = ('offers', '_table', '_negotiate')
+
+    offers: t.Tuple[MediaType, ...]
+    _table: t.Tuple[t.Tuple[MediaType, str, str, t.Set[t.Tuple[str, str]]]]
+
+    def __init__(self, offers: t.Iterable[str]):
+        self.offers = tuple(MediaType(offer) for offer in offers)
+        if not self.offers:
+            raise ValueError('A negotiator needs at least one offer.')
+        self._table = tuple(
+            (offer,
+             offer.maintype.lower(),
+             (offer.subtype or '').lower(),
+             {(key.lower(), value) for key, value in offer.options.items()})
+            for offer in self.offers
+        )
+        self._negotiate = lru_cache(maxsize=self.cache_size)(self.best)
+
+    def best(self, accept: str) -> t.Optional[MediaType]:
+        if not accept.strip():
+            return self.offers[0]
+        ranges = [
+            (media,
+             media.maintype.lower(),
+             media.subtype.lower(),
+             {(key.lower(), value) for key, value in media.options.items()
+              if key.lower() != 'q'})
+            for media in parse_accept(accept)
+        ]
+        best, best_quality = None, 0.0
+        for offer, maintype, subtype, params in self._table:
+            matched = None
+            for media, range_maintype, range_subtype, range_params in ranges:
+                if range_maintype != '*' and (
+                        range_maintype != maintype or
+                        range_subtype not in ('*', subtype)):
+                    continue
+                if not range_params <= params:
+                    continue
+                if matched is None or \
+                   media.specificity > matched.specificity:
+                    matched = media
+            if matched is not None and matched.quality > best_quality:
+                best, best_quality = offer, matched.quality
+        return best
+
+    def negotiate(self, accept: str) -> t.Optional[MediaType]:
+        """Returns the best offer for the Accept header, None if none
+        is acceptable.
+        """
+        return self._negotiate(accept)
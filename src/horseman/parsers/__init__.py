@@ -1,9 +1,13 @@
 import orjson
 import typing as t
+from http import HTTPStatus
+from itertools import islice
 from urllib.parse import parse_qsl
 from horseman.parsers.parser import BodyParser
-from horseman.parsers.multipart import Multipart
-from horseman.datastructures import Data
+from horseman.parsers.multipart import Multipart, MultipartStream, Part
+from horseman.datastructures import ContentType, Data, Form
+from horseman.exceptions import HTTPError, ParsingException
+from horseman.streams import read_body
 from horseman.types import Boundary, Charset, MIMEType
 
 
@@ -13,42 +17,153 @@ parser = BodyParser()
 @parser.register('application/json')
 def json_parser(body: t.IO, mimetype: MIMEType,
                 charset: Charset = 'utf-8') -> Data:
-    data = body.read()
+    data = read_body(body)
     if not data:
         raise ValueError('The body of the request is empty.')
+    utf8 = charset.lower() in ('utf-8', 'utf8')
     try:
-        jsondata = orjson.loads(data.decode(charset))
+        # orjson reads UTF-8 bytes directly: no decoding copy.
+        jsondata = orjson.loads(data if utf8 else str(data, charset))
         return Data(json=jsondata)
     except orjson.JSONDecodeError:
+        if utf8:
+            str(data, charset)  # surfaces the decoding error, if any.
         raise ValueError('Unparsable JSON body.')
 
 
+NDJSON_BLANKS = b' \t\r'
+
+
+def iter_ndjson(body: t.IO, charset: Charset = 'utf-8',
+                chunk_size: int = 65536) -> t.Iterator[t.Any]:
+    """Yields the records of a NDJSON (JSON Lines) body, reading it
+    `chunk_size` bytes at a time. Blank lines are skipped. A malformed
+    line raises a `ParsingException` with its line number, when it is
+    reached.
+    """
+    utf8 = charset.lower() in ('utf-8', 'utf8')
+    pending: t.List[memoryview] = []
+    lineno = 0
+
+    def blank(line) -> bool:
+        # Only lines starting with a blank are copied to be stripped.
+        return not line or (
+            line[0] in NDJSON_BLANKS and not bytes(line).strip())
+
+    def decode(line):
+        try:
+            return orjson.loads(line if utf8 else str(line, charset))
+        except (orjson.JSONDecodeError, UnicodeDecodeError) as exc:
+            raise ParsingException(f'Line {lineno}: {exc}')
+
+    while chunk := body.read(chunk_size):
+        view = memoryview(chunk)
+        start = 0
+        while (end := chunk.find(b'\n', start)) >= 0:
+            lineno += 1
+            if pending:
+                pending.append(view[start:end])
+                line = b''.join(pending)
+                pending.clear()
+            else:
+                line = view[start:end]
+            if not blank(line):
+                yield decode(line)
+            start = end + 1
+        if start < len(chunk):
+            pending.append(view[start:])
+    if pending:
+        lineno += 1
+        if not blank(line := b''.join(pending)):
+            yield decode(line)
+
+
+def iter_ndjson_batches(body: t.IO, batch_size: int,
+                        charset: Charset = 'utf-8',
+                        chunk_size: int = 65536
+                        ) -> t.Iterator[t.List[t.Any]]:
+    """Yields the records of a NDJSON body in lists of `batch_size`.
+    """
+    records = iter_ndjson(body, charset, chunk_size)
+    while batch := list(islice(records, batch_size)):
+        yield batch
+
+
+@parser.register('application/x-ndjson')
+def ndjson_parser(body: t.IO, mimetype: MIMEType,
+                  charset: Charset = 'utf-8') -> Data:
+    """The records are decoded lazily, as `Data.json` is iterated:
+    a malformed line raises a 400 `HTTPError` when it is reached.
+    """
+    def records() -> t.Iterator[t.Any]:
+        try:
+            yield from iter_ndjson(body, charset)
+        except ParsingException as exc:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(exc))
+
+    return Data(json=records())
+
+
 @parser.register('multipart/form-data')
 def multipart_parser(body: t.IO, mimetype: MIMEType,
-                     boundary: t.Optional[Boundary] = None) -> Data:
+                     boundary: t.Optional[Boundary] = None,
+                     charset: t.Optional[Charset] = None) -> Data:
     if boundary is None:
         raise ValueError('Missing boundary in Content-Type.')
-    content_parser = Multipart(f";boundary={boundary}")
-    while chunk := body.read(8192):
-        try:
-            content_parser.feed_data(chunk)
-        except ValueError:
-            raise ValueError('Unparsable multipart body.')
-    return Data(form=content_parser.form)
+    content_parser = Multipart(f";boundary={boundary}", charset=charset)
+    try:
+        while chunk := body.read(8192):
+            try:
+                content_parser.feed_data(chunk)
+            except ValueError:
+                raise ValueError('Unparsable multipart body.')
+        if not content_parser.complete:
+            raise ValueError('Truncated multipart body.')
+    except Exception:
+        content_parser.discard()
+        raise
+    return Data(form=Form(content_parser.form))
+
+
+def multipart_stream(body: t.IO, content_type: t.Union[str, ContentType],
+                     chunk_size: int = 8192,
+                     max_size: t.Optional[int] = None,
+                     max_field_size: t.Optional[int] = None
+                     ) -> t.Iterator[Part]:
+    """Yields the parts of a multipart body lazily, as they are read.
+    See `MultipartStream`.
+    """
+    content_type = ContentType(content_type)  # idempotent
+    if (boundary := content_type.options.get('boundary')) is None:
+        raise HTTPError(
+            HTTPStatus.BAD_REQUEST, 'Missing boundary in Content-Type.')
+    return iter(MultipartStream(
+        body, f";boundary={boundary}",
+        chunk_size=chunk_size,
+        charset=content_type.options.get('charset', Multipart.CHARSET),
+        max_size=max_size,
+        max_field_size=max_field_size
+    ))
 
 
 @parser.register('application/x-www-form-urlencoded')
 def urlencoded_parser(body: t.IO, mimetype: MIMEType,
                       charset: Charset = 'utf-8') -> Data:
-    data = body.read()
+    data = read_body(body)
     if not data:
         raise ValueError('The body of the request is empty.')
+    if Form.MAX_NUM_FIELDS is not None and \
+       data.count(b'&') >= Form.MAX_NUM_FIELDS:
+        raise HTTPError(
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            f'Form exceeds {Form.MAX_NUM_FIELDS} fields.'
+        )
     try:
         form = parse_qsl(
-            data.decode(charset),
+            str(data, charset),
             keep_blank_values=True,
             strict_parsing=True
         )
     except UnicodeDecodeError:
         raise ValueError(f'Failed to decode using charset {charset!r}.')
-    return Data(form=form)
+    return Data(form=Form(form))
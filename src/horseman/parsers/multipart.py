@@ -1,29 +1,149 @@
+import io
+import base64
+import hashlib
 import typing as t
-from io import BytesIO
+from http import HTTPStatus
+from tempfile import SpooledTemporaryFile
 from multifruits import Parser, extract_filename, parse_content_disposition
+from horseman.datastructures import Form
+from horseman.exceptions import HTTPError
+
+
+Storage = t.Callable[[], t.BinaryIO]
+
+# Digest algorithms of the `Digest` and `Content-Digest` headers.
+DIGEST_ALGORITHMS: t.Mapping[str, str] = {
+    'md5': 'md5',
+    'sha': 'sha1',
+    'sha-256': 'sha256',
+    'sha-512': 'sha512',
+}
+
+
+def declared_digests(headers: t.Mapping[bytes, bytes]
+                     ) -> t.Dict[str, bytes]:
+    """Returns the digests declared by the `Content-MD5`, `Digest`
+    or `Content-Digest` headers of a part, by `hashlib` name.
+    Unknown algorithms are ignored.
+    """
+    digests = {}
+    if (value := headers.get(b'Content-MD5')):
+        digests['md5'] = base64.b64decode(value.strip(), validate=True)
+    for header in (b'Digest', b'Content-Digest'):
+        if not (value := headers.get(header)):
+            continue
+        for item in value.decode('latin-1').split(','):
+            algorithm, _, encoded = item.strip().partition('=')
+            if (name := DIGEST_ALGORITHMS.get(algorithm.lower())):
+                # Content-Digest wraps the value in colons (RFC 9530).
+                digests[name] = base64.b64decode(
+                    encoded.strip().strip(':'), validate=True)
+    return digests
 
 
 class Multipart:
     """Responsible of the parsing of multipart encoded body.
+
+    File parts are written in a stream created by `storage`. It
+    defaults to a temporary file, kept in memory until it exceeds
+    `SPOOL_THRESHOLD` bytes. Text fields are accumulated as bytes
+    and decoded once complete, using `charset`.
+    The `digests` of the file parts, `hashlib` algorithm names, are
+    computed as the data is received and stored as hexadecimal
+    strings in their `digests` attribute. With `verify`, the digests
+    declared by the part headers are checked, raising a 400 if they
+    do not match.
+    `max_part_size`, `max_field_size` and `max_size` cap the size of
+    a file part, of a text field and of the whole body, raising a 413
+    as soon as they are exceeded, as does `max_num_fields` for the
+    number of parts. The class defaults, and `Form.MAX_NUM_FIELDS`,
+    can be changed application-wide.
+    `complete` is true once the closing boundary was parsed.
     """
 
+    SPOOL_THRESHOLD: t.ClassVar[int] = 1024 * 1024
+    CHARSET: t.ClassVar[str] = 'utf-8'
+    MAX_PART_SIZE: t.ClassVar[t.Optional[int]] = None
+    MAX_FIELD_SIZE: t.ClassVar[t.Optional[int]] = None
+    MAX_SIZE: t.ClassVar[t.Optional[int]] = None
+    DIGESTS: t.ClassVar[t.Tuple[str, ...]] = ()
+    VERIFY_DIGESTS: t.ClassVar[bool] = False
+
     __slots__ = (
         'form',
         'files',
+        'storage',
+        'charset',
+        'digests',
+        'verify',
+        'max_part_size',
+        'max_field_size',
+        'max_size',
+        'max_num_fields',
+        'complete',
+        '_size',
+        '_fields',
         '_parser',
         '_current',
         '_current_headers',
-        '_current_params'
+        '_current_params',
+        '_current_hashes',
+        '_current_expected'
     )
 
-    def __init__(self, content_type: str):
+    def __init__(self, content_type: str,
+                 storage: t.Optional[Storage] = None,
+                 charset: t.Optional[str] = None,
+                 max_part_size: t.Optional[int] = None,
+                 max_field_size: t.Optional[int] = None,
+                 max_size: t.Optional[int] = None,
+                 digests: t.Optional[t.Iterable[str]] = None,
+                 verify: t.Optional[bool] = None,
+                 max_num_fields: t.Optional[int] = None):
         self._parser = Parser(self, content_type.encode())
         self.form: t.List[t.Tuple[str, t.Any]] = []
+        self.storage = storage or self.spool
+        self.charset = charset or self.CHARSET
+        self.digests = tuple(self.DIGESTS if digests is None else digests)
+        self.verify = self.VERIFY_DIGESTS if verify is None else verify
+        self.max_part_size = (
+            self.MAX_PART_SIZE if max_part_size is None else max_part_size)
+        self.max_field_size = (
+            self.MAX_FIELD_SIZE if max_field_size is None
+            else max_field_size)
+        self.max_size = self.MAX_SIZE if max_size is None else max_size
+        self.max_num_fields = (
+            Form.MAX_NUM_FIELDS if max_num_fields is None
+            else max_num_fields)
+        self.complete = False
+        self._size = 0
+        self._fields = 0
+        self._current = None
+
+    def spool(self) -> t.BinaryIO:
+        return SpooledTemporaryFile(max_size=self.SPOOL_THRESHOLD)
 
     def feed_data(self, data: bytes):
         self._parser.feed_data(data)
 
+    def discard(self):
+        """Closes the file parts, after a parsing failure.
+        """
+        for _, value in self.form:
+            if not isinstance(value, str):
+                value.close()
+        if self._current is not None and \
+           not isinstance(self._current, bytearray):
+            self._current.close()
+
     def on_part_begin(self):
+        self._fields += 1
+        if self.max_num_fields is not None and \
+           self._fields > self.max_num_fields:
+            raise HTTPError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f'Form exceeds {self.max_num_fields} fields.'
+            )
         self._current_headers = {}
 
     def on_header(self, field: bytes, value: bytes):
@@ -37,38 +157,266 @@ class Multipart:
 
         self._current_params = params
         if b'Content-Type' in self._current_headers:
-            self._current = BytesIO()
+            self._current = self.storage()
             self._current.filename = extract_filename(params)
             self._current.size = 0
             self._current.content_type = self._current_headers[
                 b'Content-Type'
             ]
             self._current.params = params
+            self._current_expected = (
+                declared_digests(self._current_headers)
+                if self.verify else {}
+            )
+            self._current_hashes = [
+                (name, hashlib.new(name)) for name in
+                dict.fromkeys((*self.digests, *self._current_expected))
+            ]
         else:
-            self._current = ''
+            self._current = bytearray()
 
     def on_data(self, data: bytes):
+        self._size += len(data)
+        if self.max_size is not None and self._size > self.max_size:
+            raise HTTPError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f'Body exceeds {self.max_size} bytes.'
+            )
         if b'Content-Type' in self._current_headers:
-            self._current.write(data)
             self._current.size += len(data)
+            if self.max_part_size is not None and \
+               self._current.size > self.max_part_size:
+                raise HTTPError(
+                    HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                    f'File part exceeds {self.max_part_size} bytes.'
+                )
+            for _, hashed in self._current_hashes:
+                hashed.update(data)
+            self._current.write(data)
         else:
-            self._current += data.decode()
+            self._current += data
+            if self.max_field_size is not None and \
+               len(self._current) > self.max_field_size:
+                raise HTTPError(
+                    HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                    f'Field exceeds {self.max_field_size} bytes.'
+                )
 
     def on_part_complete(self):
         name = self._current_params.get(b'name', b'').decode()
         if b'Content-Type' in self._current_headers:
             self._current.seek(0)
             if not self._current.filename:
-                if not self._current.getbuffer().nbytes:
+                if not self._current.size:
                     # This is an empty file with no name
                     # We do *not* save it.
+                    self._current.close()
                     self._current = None
                     return
                 # at this point, we've got content but no name.
                 # generate one.
                 self._current.filename = str(id(self._current))
+            for algorithm, hashed in self._current_hashes:
+                expected = self._current_expected.get(algorithm)
+                if expected is not None and hashed.digest() != expected:
+                    raise HTTPError(
+                        HTTPStatus.BAD_REQUEST,
+                        f'{algorithm} digest mismatch for part {name!r}.'
+                    )
+            self._current.digests = {
+                algorithm: hashed.hexdigest()
+                for algorithm, hashed in self._current_hashes
+            }
             self.form.append((name, self._current))
         else:
             if self._current:
-                self.form.append((name, self._current))
+                # Decoded once, multibyte sequences can't be split.
+                self.form.append((name, self._current.decode(self.charset)))
         self._current = None
+
+    def on_body_complete(self):
+        self.complete = True
+
+
+class Part:
+    """A part of a multipart body, as yielded by `MultipartStream`.
+
+    Text fields have a `value`. File parts, those declaring a
+    Content-Type, have a `stream` reading the data from the body as
+    it is consumed.
+    """
+
+    __slots__ = (
+        'name', 'headers', 'params', 'filename', 'content_type',
+        'value', 'stream'
+    )
+
+    name: str
+    headers: t.Dict[bytes, bytes]
+    params: t.Dict[bytes, bytes]
+    filename: t.Optional[str]
+    content_type: t.Optional[bytes]
+    value: t.Optional[str]
+    stream: t.Optional['PartStream']
+
+    def __init__(self, headers: t.Dict[bytes, bytes],
+                 params: t.Dict[bytes, bytes]):
+        self.headers = headers
+        self.params = params
+        self.name = params.get(b'name', b'').decode()
+        self.content_type = headers.get(b'Content-Type')
+        self.filename = (
+            extract_filename(params) if self.content_type else None)
+        self.value = None
+        self.stream = None
+
+    @property
+    def is_file(self) -> bool:
+        return self.content_type is not None
+
+    def __repr__(self) -> str:
+        return f'<Part {self.name!r} filename={self.filename!r}>'
+
+
+class PartStream(io.RawIOBase):
+    """Readable stream of the data of a file part.
+    It pulls the body through the parser as it is read.
+    """
+
+    def __init__(self, multipart: 'MultipartStream'):
+        self._multipart = multipart
+        self._pending = b''
+        self._complete = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self._pending:
+            if self._complete:
+                return 0
+            if (data := self._multipart.next_data()) is None:
+                self._complete = True
+                return 0
+            self._pending = data
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def drain(self):
+        """Skips the unread data of the part.
+        """
+        self._pending = b''
+        while not self._complete:
+            if self._multipart.next_data() is None:
+                self._complete = True
+
+
+class MultipartStream:
+    """Lazy parsing of a multipart encoded body, yielding the parts
+    as their headers are parsed. The body is read `chunk_size` bytes
+    at a time, only when needed. Moving to the next part skips what
+    was left unread of the current file part. A body ending before
+    its closing boundary raises a 400.
+    Text fields are read whole: `max_field_size`, defaulting to
+    `Multipart.MAX_FIELD_SIZE`, caps them with a 413.
+    """
+
+    __slots__ = (
+        'body', 'chunk_size', 'charset', 'max_size', 'max_field_size',
+        '_size', '_parser', '_events', '_headers', '_complete'
+    )
+
+    def __init__(self, body: t.BinaryIO, content_type: str,
+                 chunk_size: int = 8192,
+                 charset: str = Multipart.CHARSET,
+                 max_size: t.Optional[int] = None,
+                 max_field_size: t.Optional[int] = None):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.charset = charset
+        self.max_size = max_size
+        self.max_field_size = (
+            Multipart.MAX_FIELD_SIZE if max_field_size is None
+            else max_field_size)
+        self._size = 0
+        self._complete = False
+        self._parser = Parser(self, content_type.encode())
+        self._events: t.Deque[t.Tuple[str, t.Any]] = t.Deque()
+
+    def on_part_begin(self):
+        self._headers = {}
+
+    def on_header(self, field: bytes, value: bytes):
+        self._headers[field] = value
+
+    def on_headers_complete(self):
+        disposition_type, params = parse_content_disposition(
+            self._headers.get(b'Content-Disposition'))
+        if not disposition_type:
+            raise ValueError('Content-Disposition is missing.')
+        self._events.append(('part', Part(self._headers, params)))
+
+    def on_data(self, data: bytes):
+        self._size += len(data)
+        if self.max_size is not None and self._size > self.max_size:
+            raise HTTPError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f'Body exceeds {self.max_size} bytes.'
+            )
+        self._events.append(('data', data))
+
+    def on_part_complete(self):
+        self._events.append(('end', None))
+
+    def on_body_complete(self):
+        self._complete = True
+
+    def next_event(self) -> t.Optional[t.Tuple[str, t.Any]]:
+        while not self._events:
+            if not (chunk := self.body.read(self.chunk_size)):
+                if not self._complete:
+                    raise HTTPError(
+                        HTTPStatus.BAD_REQUEST, 'Truncated multipart body.')
+                return None
+            try:
+                self._parser.feed_data(chunk)
+            except ValueError:
+                raise HTTPError(
+                    HTTPStatus.BAD_REQUEST, 'Unparsable multipart body.')
+        return self._events.popleft()
+
+    def next_data(self) -> t.Optional[bytes]:
+        """Returns the next chunk of data of the current part, or None
+        if the part is complete.
+        """
+        event = self.next_event()
+        if event is None or event[0] != 'data':
+            return None
+        return event[1]
+
+    def __iter__(self) -> t.Iterator[Part]:
+        stream: t.Optional[PartStream] = None
+        while (event := self.next_event()) is not None:
+            if event[0] != 'part':
+                continue
+            part = event[1]
+            if part.is_file:
+                part.stream = stream = PartStream(self)
+            else:
+                value = bytearray()
+                while (data := self.next_data()) is not None:
+                    value += data
+                    if self.max_field_size is not None and \
+                       len(value) > self.max_field_size:
+                        raise HTTPError(
+                            HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            f'Field exceeds {self.max_field_size} bytes.'
+                        )
+                part.value = value.decode(self.charset)
+            yield part
+            if stream is not None:
+                # the 'end' event of a file part is consumed by its stream.
+                stream.drain()
+                stream = None
@@ -1,12 +1,14 @@
 import re
 import typing as t
+from functools import lru_cache
 from http import HTTPStatus
 from horseman.exceptions import HTTPError
 from horseman.datastructures import ContentType, Data
 from horseman.types import Boundary, Charset, MIMEType
 
 
-MIME_TYPE_REGEX = re.compile(r"^multipart|[-\w.]+/[-\w.\+]+$")
+MIME_TYPE_REGEX = re.compile(
+    r"^multipart|\*/\*|[-\w.]+/(\*|[-\w.\+]+)$")
 
 Parser = t.Callable[[
     t.IO, MIMEType, t.Optional[t.Union[Charset, Boundary]]
@@ -14,8 +16,57 @@ Parser = t.Callable[[
 
 
 class BodyParser(t.Dict[MIMEType, Parser]):
+    """Registry of body parsers, by MIME type.
 
-    __slots__ = ()
+    A MIME type without parser falls back to its structured syntax
+    suffix (`application/vnd.api+json` to `application/json`), then
+    to the wildcards `maintype/*` and `*/*`, if registered.
+    Resolutions are cached per raw Content-Type header, in a LRU of
+    `cache_size` entries, cleared on registration.
+    """
+
+    __slots__ = ('_resolve',)
+
+    cache_size: t.ClassVar[int] = 256
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._resolve = lru_cache(maxsize=self.cache_size)(self.resolve)
+
+    def __setitem__(self, mimetype: MIMEType, parser: Parser):
+        super().__setitem__(mimetype, parser)
+        self._resolve.cache_clear()
+
+    def __delitem__(self, mimetype: MIMEType):
+        super().__delitem__(mimetype)
+        self._resolve.cache_clear()
+
+    # The dict methods below don't go through `__setitem__` or
+    # `__delitem__`: they clear the resolutions themselves.
+
+    def pop(self, mimetype: MIMEType, *default: t.Any) -> t.Any:
+        parser = super().pop(mimetype, *default)
+        self._resolve.cache_clear()
+        return parser
+
+    def popitem(self) -> t.Tuple[MIMEType, Parser]:
+        item = super().popitem()
+        self._resolve.cache_clear()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._resolve.cache_clear()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._resolve.cache_clear()
+
+    def setdefault(self, mimetype: MIMEType,
+                   parser: t.Optional[Parser] = None) -> t.Optional[Parser]:
+        parser = super().setdefault(mimetype, parser)
+        self._resolve.cache_clear()
+        return parser
 
     def register(self, mimetype: str):
         if not MIME_TYPE_REGEX.fullmatch(mimetype):
@@ -26,9 +77,30 @@ class BodyParser(t.Dict[MIMEType, Parser]):
             return parser
         return registration
 
-    def parse(self, body: t.IO, header: t.Union[str, ContentType]) -> Data:
+    def find(self, mimetype: str) -> t.Optional[Parser]:
+        mimetype = mimetype.lower()
+        if (parser := self.get(mimetype)) is not None:
+            return parser
+        maintype, _, subtype = mimetype.partition('/')
+        candidates = []
+        if '+' in subtype:
+            suffix = subtype.rsplit('+', 1)[1]
+            candidates.append(f'{maintype}/{suffix}')
+            candidates.append(f'application/{suffix}')
+        candidates.append(f'{maintype}/*')
+        candidates.append('*/*')
+        for candidate in candidates:
+            if (parser := self.get(candidate)) is not None:
+                return parser
+        return None
+
+    def resolve(self, header: t.Union[str, ContentType]
+                ) -> t.Tuple[t.Optional[Parser], ContentType]:
         content_type = ContentType(header)  # idempotent
-        parser = self.get(content_type.mimetype)
+        return self.find(content_type.mimetype), content_type
+
+    def parse(self, body: t.IO, header: t.Union[str, ContentType]) -> Data:
+        parser, content_type = self._resolve(header)
         if parser is None:
             raise HTTPError(
                 HTTPStatus.BAD_REQUEST,
@@ -1,8 +1,19 @@
+import os
+import mmap
+import time
+import uuid
+import orjson
+import hashlib
+import functools
+import mimetypes
 import typing as t
+from datetime import datetime
 from http import HTTPStatus
 from multidict import CIMultiDict
 from horseman.datastructures import Cookies
 from horseman.types import Environ, HTTPCode, StartResponse
+from horseman.utils import (
+    http_date, parse_etags, parse_http_date, parse_range, weak_etag_match)
 
 
 BODYLESS = frozenset((
@@ -44,6 +55,20 @@ class Headers(CIMultiDict[str]):
             for cookie in self._cookies.values():
                 yield 'Set-Cookie', str(cookie)
 
+    def serialize(self) -> t.List[t.Tuple[str, str]]:
+        """Returns the list of headers, as expected by `start_response`.
+        """
+        headers = [(str(k), str(v)) for k, v in super().items()]
+        if self._cookies:
+            headers.extend(
+                ('Set-Cookie', str(cookie))
+                for cookie in self._cookies.values()
+            )
+        return headers
+
+    def freeze(self) -> 'FrozenHeaders':
+        return FrozenHeaders(self)
+
     def coalesced_items(self) -> t.Iterable[t.Tuple[str, str]]:
         """Coalescence of headers does NOT garanty order of headers.
         It garanties the order of the header values, though.
@@ -63,31 +88,165 @@ class Headers(CIMultiDict[str]):
             yield 'Set-Cookie', ', '.join(cookies)
 
 
+class FrozenHeaders(t.Tuple[t.Tuple[str, str], ...]):
+    """Immutable and pre-serialized block of headers.
+
+    A block can be shared by many responses (security headers, CORS):
+    it is serialized once and passed as is to `start_response`.
+    A response only copies it into a mutable `Headers` if its
+    headers are accessed. Blocks can be concatenated with `+`.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, headers: HeadersT = ()):
+        if isinstance(headers, cls):
+            return headers
+        if isinstance(headers, Headers):
+            return super().__new__(cls, headers.serialize())
+        if isinstance(headers, t.Mapping):
+            headers = headers.items()
+        return super().__new__(
+            cls, ((str(k), str(v)) for k, v in headers))
+
+    def __add__(self, other: HeadersT) -> 'FrozenHeaders':
+        return tuple.__new__(
+            self.__class__,
+            (*self, *self.__class__(other))
+        )
+
+
+NO_HEADERS = FrozenHeaders()
+TEXT_CONTENT_TYPE = 'text/plain; charset=utf-8'
+
+
 Finisher = t.Callable[['Response'], None]
 
 
+@functools.cache
+def description(status: HTTPStatus) -> bytes:
+    """Encoded description of the status, used as default body."""
+    return status.description.encode()
+
+
+# Larger payloads are hashed on each call, not kept alive by the LRU.
+ETAG_CACHE_MAX_SIZE = 65536
+
+
+def _etag(payload: bytes) -> str:
+    return f'"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+
+_cached_etag = functools.lru_cache(maxsize=128)(_etag)
+
+
+def compute_etag(payload: bytes) -> str:
+    """Strong entity tag of the payload. Payloads up to
+    `ETAG_CACHE_MAX_SIZE` bytes are memoized in a LRU of 128 entries,
+    bounding the memory it holds to 8 MiB.
+    """
+    if len(payload) > ETAG_CACHE_MAX_SIZE:
+        return _etag(payload)
+    return _cached_etag(payload)
+
+
+def coalesce(chunks: t.Iterable[bytes],
+             buffer_size: int = 32768,
+             flush_interval: t.Optional[float] = None
+             ) -> t.Iterator[bytes]:
+    """Coalesces the chunks into blocks of at least `buffer_size`
+    bytes, using a reusable buffer. Chunks larger than the buffer are
+    passed through, untouched, when the buffer is empty.
+
+    If `flush_interval` is given, the buffer is also flushed when a
+    chunk arrives more than `flush_interval` seconds after the oldest
+    buffered one. The flush can only happen when the producer yields.
+    """
+    buffer = bytearray()
+    deadline = 0.0
+    for chunk in chunks:
+        if not buffer:
+            if len(chunk) >= buffer_size:
+                yield chunk
+                continue
+            if flush_interval is not None:
+                deadline = time.monotonic() + flush_interval
+        buffer += chunk
+        if len(buffer) >= buffer_size or (
+                flush_interval is not None and
+                time.monotonic() >= deadline):
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
 class Response:
 
-    __slots__ = ('status', 'body', 'headers', '_finishers')
+    __slots__ = (
+        'status', 'body', 'buffer_size', 'flush_interval',
+        '_headers', '_frozen_headers', '_finishers', '_ranges'
+    )
 
     status: HTTPStatus
     body: t.Optional[BodyT]
-    headers: Headers
+    buffer_size: t.Optional[int]
+    flush_interval: t.Optional[float]
+    _headers: t.Optional[Headers]
+    _frozen_headers: t.Optional[FrozenHeaders]
     _finishers: t.Optional[t.Deque[Finisher]]
+    _ranges: t.Optional[t.List[t.Tuple[int, int, bytes]]]
 
     def __init__(self,
                  status: HTTPCode = 200,
                  body: BodyT = None,
-                 headers: t.Optional[HeadersT] = None):
+                 headers: t.Optional[HeadersT] = None,
+                 buffer_size: t.Optional[int] = None,
+                 flush_interval: t.Optional[float] = None):
+        """The headers are kept serialized until they are accessed
+        through the `headers` attribute, which then copies them into
+        a mutable `Headers`. `Headers` instances are copied right away.
+
+        When `buffer_size` is set, the chunks of an iterable body
+        are coalesced into blocks of at least that many bytes.
+        See `coalesce`.
+        """
         self.status = HTTPStatus(status)
         self.body = body
-        self.headers = Headers(headers or ())  # idempotent.
+        if isinstance(headers, Headers):
+            self._headers = Headers(headers)  # idempotent.
+            self._frozen_headers = None
+        else:
+            self._headers = None
+            self._frozen_headers = (
+                FrozenHeaders(headers) if headers else NO_HEADERS
+            )
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
         self._finishers = None
+        self._ranges = None
+
+    @property
+    def headers(self) -> Headers:
+        if self._headers is None:
+            self._headers = Headers(self._frozen_headers)
+            self._frozen_headers = None
+        return self._headers
+
+    @headers.setter
+    def headers(self, headers: HeadersT):
+        self._headers = Headers(headers)
+        self._frozen_headers = None
 
     @property
     def cookies(self):
         return self.headers.cookies
 
+    def header_list(self) -> t.List[t.Tuple[str, str]]:
+        if self._headers is None:
+            return list(self._frozen_headers)
+        return self._headers.serialize()
+
     def close(self):
         """Exhaust the list of finishers. No error is handled here.
         An exception will cause the closing operation to fail during
@@ -103,16 +262,178 @@ class Response:
             self._finishers = t.Deque()
         self._finishers.append(task)
 
+    def conditional(self, environ: Environ,
+                    etag: t.Optional[str] = None,
+                    last_modified: t.Optional[
+                        t.Union[datetime, float]] = None) -> 'Response':
+        """Sets the ETag and Last-Modified headers and evaluates the
+        If-None-Match and If-Modified-Since headers of the request.
+        A matching GET or HEAD request turns the response into a
+        bodyless 304. Other methods get a 412.
+
+        The ETag defaults to the one in the headers, then to a strong
+        ETag of the body, if it is materialized. Streamed bodies need
+        an explicit `etag` or `last_modified`.
+        Only 200 responses are affected.
+        """
+        if self.status != HTTPStatus.OK:
+            return self
+
+        headers = self.headers
+        if etag is None:
+            etag = headers.get('ETag')
+            if etag is None and (payload := self.payload()) is not None:
+                etag = compute_etag(payload)
+        elif etag[:1] != '"' and etag[:3] != 'W/"':
+            etag = f'"{etag}"'
+        if etag is not None:
+            headers['ETag'] = etag
+
+        if last_modified is not None:
+            headers['Last-Modified'] = http_date(last_modified)
+        if (value := headers.get('Last-Modified')):
+            modified = parse_http_date(value)
+        else:
+            modified = None
+
+        method = environ.get('REQUEST_METHOD', 'GET').upper()
+        if (if_none_match := environ.get('HTTP_IF_NONE_MATCH')):
+            tags = parse_etags(if_none_match)
+            if '*' not in tags and (
+                    etag is None or not weak_etag_match(etag, tags)):
+                return self
+            if method not in ('GET', 'HEAD'):
+                # The status description replaces the representation.
+                self.status = HTTPStatus.PRECONDITION_FAILED
+                self.body = None
+                for name in ('Content-Type', 'Content-Length', 'ETag'):
+                    headers.popall(name, None)
+                return self
+        elif modified is not None and method in ('GET', 'HEAD') and (
+                since := environ.get('HTTP_IF_MODIFIED_SINCE')):
+            since = parse_http_date(since)
+            if since is None or modified > since:
+                return self
+        else:
+            return self
+
+        self.status = HTTPStatus.NOT_MODIFIED
+        self.body = None
+        return self
+
+    def size(self) -> t.Optional[int]:
+        """Size of the full representation, if it is known."""
+        if (payload := self.payload()) is not None:
+            return len(payload)
+        return None
+
+    def read_range(self, start: int, end: int) -> t.Iterator[bytes]:
+        yield memoryview(self.payload())[start:end].tobytes()
+
+    def partial(self, environ: Environ,
+                max_ranges: int = 16) -> 'Response':
+        """Evaluates the Range and If-Range headers of a GET request.
+        Satisfiable ranges turn the response into a 206, with a
+        `multipart/byteranges` body for several ranges. Unsatisfiable
+        ranges return a new 416 response, with the `Content-Range:
+        bytes */<size>` header: the response is closed along with it.
+        Invalid headers, unknown sizes and more than `max_ranges`
+        ranges give the full representation.
+        Only 200 responses are affected.
+        """
+        if self.status != HTTPStatus.OK or \
+           environ.get('REQUEST_METHOD', 'GET').upper() != 'GET':
+            return self
+        if (size := self.size()) is None:
+            return self
+
+        headers = self.headers
+        headers['Accept-Ranges'] = 'bytes'
+        if not (header := environ.get('HTTP_RANGE')):
+            return self
+
+        if (if_range := environ.get('HTTP_IF_RANGE')):
+            if if_range[:1] == '"' or if_range[:2] == 'W/':
+                # Strong comparison: weak tags never match.
+                if if_range[:2] == 'W/' or if_range != headers.get('ETag'):
+                    return self
+            elif if_range != headers.get('Last-Modified'):
+                return self
+
+        ranges = parse_range(header, size)
+        if ranges is None or len(ranges) > max_ranges:
+            return self
+        if not ranges:
+            unsatisfiable = Response(
+                HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={'Content-Range': f'bytes */{size}'}
+            )
+            unsatisfiable.add_finisher(lambda _: self.close())
+            return unsatisfiable
+
+        self.status = HTTPStatus.PARTIAL_CONTENT
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            headers['Content-Range'] = f'bytes {start}-{end - 1}/{size}'
+            headers['Content-Length'] = str(end - start)
+            self._ranges = [(start, end, b'')]
+            return self
+
+        boundary = uuid.uuid4().hex
+        content_type = headers.get('Content-Type')
+        self._ranges = []
+        length = 0
+        for start, end in ranges:
+            part = f'--{boundary}\r\n'
+            if content_type:
+                part += f'Content-Type: {content_type}\r\n'
+            part += f'Content-Range: bytes {start}-{end - 1}/{size}\r\n\r\n'
+            prefix = part.encode('latin-1')
+            self._ranges.append((start, end, prefix))
+            length += len(prefix) + end - start + 2
+        self._ranges.append((0, 0, f'--{boundary}--\r\n'.encode()))
+        length += len(boundary) + 6
+        headers['Content-Type'] = f'multipart/byteranges; boundary={boundary}'
+        headers['Content-Length'] = str(length)
+        return self
+
+    def iter_ranges(self) -> t.Iterator[bytes]:
+        multipart = len(self._ranges) > 1
+        for start, end, prefix in self._ranges:
+            if prefix:
+                yield prefix
+            if end > start:
+                yield from self.read_range(start, end)
+                if multipart:
+                    yield b'\r\n'
+
+    def payload(self) -> t.Optional[bytes]:
+        """Returns the encoded body if it is materialized, or None
+        if it is streamed. A `str` body is replaced by its encoded
+        value, so that it is only encoded once.
+        """
+        body = self.body
+        if body is None:
+            return description(self.status)
+        if isinstance(body, bytes):
+            return body
+        if isinstance(body, str):
+            self.body = body = body.encode()
+            return body
+        return None
+
     def __iter__(self) -> t.Iterator[bytes]:
         if self.status not in BODYLESS:
-            if self.body is None:
-                yield self.status.description.encode()
-            elif isinstance(self.body, bytes):
-                yield self.body
-            elif isinstance(self.body, str):
-                yield self.body.encode()
+            if self._ranges is not None:
+                yield from self.iter_ranges()
+            elif (payload := self.payload()) is not None:
+                yield payload
             elif isinstance(self.body, t.Iterable):
-                yield from self.body
+                if self.buffer_size:
+                    yield from coalesce(
+                        self.body, self.buffer_size, self.flush_interval)
+                else:
+                    yield from self.body
             else:
                 raise TypeError(
                     f'Body of type {type(self.body)!r} is not supported.'
@@ -120,6 +441,189 @@ class Response:
 
     def __call__(self, environ: Environ,
                  start_response: StartResponse) -> t.Iterable[bytes]:
+        """The Content-Length is added for materialized bodies, unless
+        already set. Streamed bodies must declare it in the headers.
+        It is never added for `BODYLESS` statuses: 1xx and 204 must
+        not carry one and a 304 would have to advertise the length of
+        the unmodified representation.
+        Text bodies, the status description or a `str`, default to
+        `TEXT_CONTENT_TYPE` when no Content-Type is set.
+        """
         status = f'{self.status.value} {self.status.phrase}'
-        start_response(status, list(self.headers.items()))
+        headers = self.header_list()
+        if self.status not in BODYLESS:
+            textual = self.body is None or isinstance(self.body, str)
+            if (payload := self.payload()) is not None:
+                names = {name.lower() for name, _ in headers}
+                if textual and 'content-type' not in names:
+                    headers.append(('Content-Type', TEXT_CONTENT_TYPE))
+                if 'content-length' not in names:
+                    headers.append(('Content-Length', str(len(payload))))
+        start_response(status, headers)
+        return self
+
+
+def close_body(response: Response):
+    response.body.close()
+
+
+class FileResponse(Response):
+    """Response streaming a binary file.
+
+    The Content-Length is computed from `fstat`. When the WSGI server
+    provides a `wsgi.file_wrapper`, the response hands itself over to
+    it as a file-like object, allowing zero-copy transmission with
+    `sendfile(2)`. Otherwise, the file is memory-mapped and iterated
+    in chunks of `block_size` bytes. The file is closed by `close()`.
+    """
+
+    __slots__ = ('block_size', '_offset')
+
+    body: t.BinaryIO
+    block_size: int
+    _offset: t.Optional[int]
+
+    def __init__(self,
+                 file: t.Union[str, os.PathLike, t.BinaryIO],
+                 status: HTTPCode = 200,
+                 headers: t.Optional[HeadersT] = None,
+                 content_type: t.Optional[str] = None,
+                 block_size: int = 65536):
+        if isinstance(file, (str, os.PathLike)):
+            if content_type is None:
+                content_type = mimetypes.guess_type(file)[0]
+            file = open(file, 'rb')
+        super().__init__(status, file, headers)
+        self.block_size = block_size
+        self.add_finisher(close_body)
+        if content_type and 'Content-Type' not in self.headers:
+            self.headers['Content-Type'] = content_type
+        if (size := self.remaining()) is not None:
+            self.headers['Content-Length'] = str(size)
+            self._offset = self.body.tell()
+        else:
+            self._offset = None
+
+    def remaining(self) -> t.Optional[int]:
+        """Size of the file from the current position, if it is
+        backed by a file descriptor.
+        """
+        try:
+            return os.fstat(self.body.fileno()).st_size - self.body.tell()
+        except (AttributeError, OSError):
+            return None
+
+    def size(self) -> t.Optional[int]:
+        if self._offset is None:
+            return None
+        return os.fstat(self.body.fileno()).st_size - self._offset
+
+    def read_range(self, start: int, end: int) -> t.Iterator[bytes]:
+        self.body.seek(self._offset + start)
+        remaining = end - start
+        while remaining > 0:
+            if not (chunk := self.body.read(min(remaining, self.block_size))):
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+    # File-like API, used by `wsgi.file_wrapper`.
+    def fileno(self) -> int:
+        return self.body.fileno()
+
+    def read(self, size: int = -1) -> bytes:
+        return self.body.read(size)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self.body.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.body.tell()
+
+    def __iter__(self) -> t.Iterator[bytes]:
+        if self.status in BODYLESS:
+            return
+        if self._ranges is not None:
+            yield from self.iter_ranges()
+            return
+        try:
+            offset = self.body.tell()
+            mapped = mmap.mmap(
+                self.body.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            # No file descriptor, empty file or unmappable file.
+            mapped = None
+
+        if mapped is None:
+            while chunk := self.body.read(self.block_size):
+                yield chunk
+        else:
+            with mapped:
+                for start in range(offset, len(mapped), self.block_size):
+                    yield mapped[start:start + self.block_size]
+
+    def __call__(self, environ: Environ,
+                 start_response: StartResponse) -> t.Iterable[bytes]:
+        super().__call__(environ, start_response)
+        if self.status not in BODYLESS and self._ranges is None:
+            wrapper = environ.get('wsgi.file_wrapper')
+            if wrapper is not None:
+                return wrapper(self, self.block_size)
+        return self
+
+
+JSON_HEADERS = FrozenHeaders({'Content-Type': 'application/json'})
+
+
+class JSONResponse(Response):
+    """Response serializing its content to JSON bytes with orjson.
+
+    `option` and `default` are passed to `orjson.dumps`, e.g.
+    `orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS`. Dataclasses
+    are serialized natively. If `lazy` is true, the serialization is
+    deferred until the payload is needed: it never happens for a
+    bodyless status.
+    """
+
+    __slots__ = ('content', 'option', 'default', '_serialized')
+
+    content: t.Any
+    option: t.Optional[int]
+    default: t.Optional[t.Callable[[t.Any], t.Any]]
+    _serialized: bool
+
+    def __init__(self,
+                 content: t.Any,
+                 status: HTTPCode = 200,
+                 headers: t.Optional[HeadersT] = None,
+                 option: t.Optional[int] = None,
+                 default: t.Optional[t.Callable[[t.Any], t.Any]] = None,
+                 lazy: bool = False):
+        if headers is None:
+            super().__init__(status, headers=JSON_HEADERS)
+        else:
+            super().__init__(status, headers=headers)
+            if 'Content-Type' not in self.headers:
+                self.headers['Content-Type'] = 'application/json'
+        self.content = content
+        self.option = option
+        self.default = default
+        self._serialized = False
+        if not lazy:
+            self.payload()
+
+    def payload(self) -> t.Optional[bytes]:
+        # A body cleared after the serialization is not redone: the
+        # status description is sent, as for any `Response`.
+        if not self._serialized:
+            self._serialized = True
+            self.body = orjson.dumps(
+                self.content, default=self.default, option=self.option)
+        return super().payload()
+
+    def conditional(self, *args, **kwargs) -> 'Response':
+        status = self.status
+        super().conditional(*args, **kwargs)
+        if self.status != status:
+            self._serialized = True  # the content is not sent.
         return self
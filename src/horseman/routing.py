@@ -0,0 +1,206 @@
+import re
+import uuid
+import typing as t
+from collections import UserDict
+from horseman.exceptions import HTTPError
+from horseman.mapping import RootNode
+from horseman.types import WSGICallable, Environ
+
+
+Converter = t.Callable[[str], t.Any]
+
+DECIMAL = re.compile(r'[0-9]+(\.[0-9]+)?')
+
+
+def _str(segment: str) -> str:
+    if not segment:
+        raise ValueError('Empty segment.')
+    return segment
+
+
+def _int(segment: str) -> int:
+    if not segment.isdigit():
+        raise ValueError(f'{segment!r} is not a positive integer.')
+    return int(segment)
+
+
+def _float(segment: str) -> float:
+    # `float` alone would accept 'nan', 'inf', '1_0' or '1e3'.
+    if not DECIMAL.fullmatch(segment):
+        raise ValueError(f'{segment!r} is not a positive decimal number.')
+    return float(segment)
+
+
+CONVERTERS: t.Mapping[str, Converter] = {
+    'str': _str,
+    'int': _int,
+    'float': _float,
+    'uuid': uuid.UUID,
+    'path': _str,
+}
+
+
+class RouteNode:
+    """A node of the routing tree, one per path segment.
+
+    Static segments are looked up in a dict. Parameter segments are
+    grouped by converter, tried in order with `str` last.
+    The `path` converter captures the remainder of the path and can
+    only be used in the last segment of a pattern.
+    """
+
+    __slots__ = ('static', 'params', 'catchall', 'leaf')
+
+    static: t.Dict[str, 'RouteNode']
+    params: t.List[t.Tuple[str, Converter, 'RouteNode']]
+    catchall: t.Optional['RouteNode']
+    leaf: t.Optional[t.Tuple[WSGICallable, t.Tuple[str, ...]]]
+
+    def __init__(self):
+        self.static = {}
+        self.params = []
+        self.catchall = None
+        self.leaf = None
+
+    def child(self, converter_name: str,
+              converters: t.Mapping[str, Converter]) -> 'RouteNode':
+        if converter_name == 'path':
+            if self.catchall is None:
+                self.catchall = RouteNode()
+            return self.catchall
+
+        for name, _, node in self.params:
+            if name == converter_name:
+                return node
+        if (converter := converters.get(converter_name)) is None:
+            raise ValueError(f'Unknown converter {converter_name!r}.')
+        node = RouteNode()
+        self.params.append((converter_name, converter, node))
+        self.params.sort(key=lambda param: param[0] == 'str')
+        return node
+
+    def match(self, segments: t.List[str], index: int,
+              values: t.List[t.Any]) -> t.Optional[
+                  t.Tuple[WSGICallable, t.Tuple[str, ...]]]:
+        if index == len(segments):
+            return self.leaf
+
+        segment = segments[index]
+        if (node := self.static.get(segment)) is not None:
+            if (found := node.match(segments, index + 1, values)):
+                return found
+
+        for _, converter, node in self.params:
+            try:
+                value = converter(segment)
+            except ValueError:
+                continue
+            values.append(value)
+            if (found := node.match(segments, index + 1, values)):
+                return found
+            values.pop()
+
+        if self.catchall is not None and self.catchall.leaf is not None:
+            if (remainder := '/'.join(segments[index:])):
+                values.append(remainder)
+                return self.catchall.leaf
+        return None
+
+
+class Router(RootNode, UserDict, t.Mapping[str, WSGICallable]):
+    """Dispatches on parameterized path patterns, such as
+    `/users/{id:int}/files/{path:path}`.
+
+    Patterns are compiled, segment by segment, into a tree: the
+    matching cost depends on the depth of the path, not on the number
+    of routes. The converted parameters are stored in the environ,
+    under `PATH_PARAMS`. A parameter without converter is a `str`.
+    """
+
+    converters: t.ClassVar[t.Mapping[str, Converter]] = CONVERTERS
+
+    _tree: RouteNode
+
+    def __init__(self, *args, **kwargs):
+        self._tree = RouteNode()
+        super().__init__(*args, **kwargs)
+
+    def __copy__(self):
+        inst = super().__copy__()
+        inst._rebuild()
+        return inst
+
+    def __setitem__(self, pattern: str, script: WSGICallable):
+        if not isinstance(pattern, str) or not pattern.startswith('/'):
+            raise ValueError(f'{pattern!r} is not a valid route pattern.')
+        if pattern in self.data:
+            super().__setitem__(pattern, script)
+            self._rebuild()
+        else:
+            self.compile(pattern, script)
+            super().__setitem__(pattern, script)
+
+    def __delitem__(self, pattern: str):
+        super().__delitem__(pattern)
+        self._rebuild()
+
+    def _rebuild(self):
+        self._tree = RouteNode()
+        for pattern, script in self.data.items():
+            self.compile(pattern, script)
+
+    def compile(self, pattern: str, script: WSGICallable):
+        node = self._tree
+        names: t.List[str] = []
+        segments = pattern[1:].split('/')
+        for position, segment in enumerate(segments, start=1):
+            if segment[:1] == '{' and segment[-1:] == '}':
+                name, _, converter = segment[1:-1].partition(':')
+                if not name.isidentifier():
+                    raise ValueError(
+                        f'Invalid parameter {segment!r} in {pattern!r}.')
+                if name in names:
+                    raise ValueError(
+                        f'Duplicate parameter {name!r} in {pattern!r}.')
+                converter = converter or 'str'
+                if converter == 'path' and position != len(segments):
+                    raise ValueError(
+                        f'{segment!r} must be the last segment '
+                        f'of {pattern!r}.')
+                names.append(name)
+                node = node.child(converter, self.converters)
+            elif '{' in segment or '}' in segment:
+                raise ValueError(
+                    f'Parameters must span a whole segment: {pattern!r}.')
+            else:
+                node = node.static.setdefault(segment, RouteNode())
+        if node.leaf is not None:
+            raise ValueError(
+                f'{pattern!r} conflicts with an existing route.')
+        node.leaf = (script, tuple(names))
+
+    def match(self, path_info: str) -> t.Optional[
+            t.Tuple[WSGICallable, t.Dict[str, t.Any]]]:
+        if path_info[:1] != '/':
+            return None
+        try:
+            # PATH_INFO is a latin-1 native string, as per PEP 3333.
+            path_info = path_info.encode('latin-1').decode('utf-8')
+        except UnicodeError:
+            return None
+        segments = path_info[1:].split('/')
+        values: t.List[t.Any] = []
+        if (found := self._tree.match(segments, 0, values)) is None:
+            return None
+        script, names = found
+        return script, dict(zip(names, values))
+
+    def resolve(self, environ: Environ) -> WSGICallable:
+        found = self.match(environ.get('PATH_INFO', '/'))
+        if found is None:
+            raise HTTPError(404)
+        script, params = found
+        if (existing := environ.get('PATH_PARAMS')):
+            params = {**existing, **params}
+        environ['PATH_PARAMS'] = params
+        return script
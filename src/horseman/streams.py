@@ -0,0 +1,197 @@
+import io
+import typing as t
+from http import HTTPStatus
+from tempfile import SpooledTemporaryFile
+from horseman.exceptions import HTTPError
+from horseman.types import Environ
+
+
+class InputStream(io.RawIOBase):
+    """Wraps `wsgi.input`, never reading past the Content-Length.
+
+    As per PEP 3333, a request without Content-Length has an empty
+    body, unless the server sets `wsgi.input_terminated`: the length
+    is then unknown and the stream is read until its end.
+    Bodies larger than `max_size` are rejected with a 413, before
+    reading when the length is known, while reading otherwise.
+    """
+
+    def __init__(self, stream: t.BinaryIO,
+                 length: t.Optional[int],
+                 max_size: t.Optional[int] = None):
+        if max_size is not None and length is not None \
+           and length > max_size:
+            raise HTTPError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f'Body exceeds {max_size} bytes.'
+            )
+        self.stream = stream
+        self.length = length
+        self.max_size = max_size
+        self.consumed = 0
+
+    @classmethod
+    def from_environ(cls, environ: Environ,
+                     max_size: t.Optional[int] = None) -> 'InputStream':
+        if (value := environ.get('CONTENT_LENGTH')):
+            try:
+                length = int(value)
+            except ValueError:
+                raise HTTPError(
+                    HTTPStatus.BAD_REQUEST, 'Invalid Content-Length.')
+            if length < 0:
+                raise HTTPError(
+                    HTTPStatus.BAD_REQUEST, 'Invalid Content-Length.')
+        elif environ.get('wsgi.input_terminated'):
+            length = None
+        else:
+            length = 0
+        return cls(environ['wsgi.input'], length, max_size)
+
+    def readable(self) -> bool:
+        return True
+
+    def _allowed(self, size: int) -> int:
+        if self.length is not None:
+            remaining = self.length - self.consumed
+            if size < 0 or size > remaining:
+                return remaining
+        elif self.max_size is not None:
+            # One byte past the limit is enough to reject the body.
+            limit = self.max_size - self.consumed + 1
+            if size < 0 or size > limit:
+                return limit
+        return size
+
+    def _consume(self, size: int):
+        self.consumed += size
+        if self.max_size is not None and self.consumed > self.max_size:
+            raise HTTPError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f'Body exceeds {self.max_size} bytes.'
+            )
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 and self.length is None and self.max_size is not None:
+            # Read to the end in bounded chunks, never past the limit.
+            chunks = []
+            while (chunk := self.read(self.max_size - self.consumed + 1)):
+                chunks.append(chunk)
+            return b''.join(chunks)
+        if not (size := self._allowed(size)):
+            return b''
+        data = self.stream.read(size)
+        self._consume(len(data))
+        return data
+
+    def readinto(self, buffer) -> int:
+        if not (size := self._allowed(len(buffer))):
+            return 0
+        if (readinto := getattr(self.stream, 'readinto', None)) is not None:
+            with memoryview(buffer) as view:
+                read = readinto(view[:size])
+        else:
+            data = self.stream.read(size)
+            read = len(data)
+            buffer[:read] = data
+        self._consume(read)
+        return read
+
+
+class ReplayableStream(io.RawIOBase):
+    """Records what is read from `stream`, so that it can be rewound
+    and read again: the source is only read once. The data is kept in
+    memory up to `SPOOL_THRESHOLD` bytes, then in a temporary file.
+    """
+
+    SPOOL_THRESHOLD: t.ClassVar[int] = 1024 * 1024
+
+    def __init__(self, stream: InputStream):
+        self.stream = stream
+        self._spool = SpooledTemporaryFile(max_size=self.SPOOL_THRESHOLD)
+        self._recorded = 0
+        self._position = 0
+
+    @property
+    def length(self) -> t.Optional[int]:
+        """The number of bytes left to read, if known.
+        """
+        if self.stream.length is None:
+            return None
+        return self.stream.length - self._position
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        read = 0
+        with memoryview(buffer) as view:
+            if self._position < self._recorded:
+                self._spool.seek(self._position)
+                read = self._spool.readinto(view)
+            # What the recording can't provide comes from the source.
+            if read < len(view) and \
+               (size := self.stream.readinto(view[read:])):
+                self._spool.seek(self._recorded)
+                self._spool.write(view[read:read + size])
+                self._recorded += size
+                read += size
+        self._position += read
+        return read
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            self._position = self._recorded
+            while self.read(65536):
+                pass
+            offset += self._recorded
+        if offset < 0:
+            raise ValueError(f'Negative seek position {offset}.')
+        if offset > self._recorded:
+            # Records the data up to the offset, or the end.
+            self._position = self._recorded
+            while self._position < offset:
+                if not self.read(min(offset - self._position, 65536)):
+                    break
+            offset = min(offset, self._recorded)
+        self._position = offset
+        return offset
+
+    def close(self):
+        self._spool.close()
+        super().close()
+
+
+# Initial size of the buffer of `read_body`, doubled as data comes.
+READ_BUFFER_SIZE = 65536
+
+
+def read_body(body: t.BinaryIO) -> t.Union[bytes, bytearray]:
+    """Reads the whole body. If its length is known, the body is read
+    into a buffer, without intermediate chunks. The buffer grows as the
+    data comes, up to the length: the declared length is not trusted
+    with an allocation. A body shorter than its length is rejected.
+    """
+    if (length := getattr(body, 'length', None)) is None:
+        return body.read()
+    buffer = bytearray(min(length, READ_BUFFER_SIZE))
+    read = 0
+    while read < length:
+        if read == len(buffer):
+            buffer.extend(bytes(min(read, length - read)))
+        with memoryview(buffer) as view:
+            size = body.readinto(view[read:])
+        if not size:
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST,
+                'Body is shorter than its Content-Length.')
+        read += size
+    return buffer
@@ -26,3 +26,8 @@ StartResponse = t.Callable[
     t.Optional[t.Callable[[t.ByteString], None]]
 ]
 WSGICallable = t.Callable[[Environ, StartResponse], t.Iterable[bytes]]
+
+Scope = t.Mapping[str, t.Any]
+Message = t.MutableMapping[str, t.Any]
+Receive = t.Callable[[], t.Awaitable[Message]]
+Send = t.Callable[[Message], t.Awaitable[None]]
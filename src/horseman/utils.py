@@ -1,4 +1,6 @@
 import typing as t
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 
 
 # https://peps.python.org/pep-0594/
@@ -20,6 +22,16 @@ def parse_header(line: str) -> t.Tuple[str, t.Dict[str, str]]:
     """Parse a Content-type like header.
     Return the main content-type and a dictionary of options.
     """
+    if '"' not in line:
+        # No quoted string: the parameters are split in a single pass.
+        key, *parts = line.split(';')
+        pdict = {}
+        for p in parts:
+            name, equal, value = p.partition('=')
+            if equal:
+                pdict[name.strip().lower()] = value.strip()
+        return key.strip(), pdict
+
     parts = _parseparam(";" + line)
     key = parts.__next__()
     pdict = {}
@@ -33,3 +45,90 @@ def parse_header(line: str) -> t.Tuple[str, t.Dict[str, str]]:
                 value = value.replace("\\\\", "\\").replace('\\"', '"')
             pdict[name] = value
     return key, pdict
+
+
+def parse_etags(value: str) -> t.Tuple[str, ...]:
+    """Parse an If-Match/If-None-Match like header.
+    Return the entity tags, quotes and weakness marker included,
+    or `('*',)`.
+    """
+    value = value.strip()
+    if value == '*':
+        return ('*',)
+    tags = []
+    for tag in value.split(','):
+        if (tag := tag.strip()):
+            tags.append(tag)
+    return tuple(tags)
+
+
+def weak_etag_match(etag: str, tags: t.Iterable[str]) -> bool:
+    """Weak comparison, as required for If-None-Match.
+    """
+    opaque = etag[2:] if etag[:2] == 'W/' else etag
+    for tag in tags:
+        if tag == '*' or (tag[2:] if tag[:2] == 'W/' else tag) == opaque:
+            return True
+    return False
+
+
+def parse_http_date(value: str) -> t.Optional[datetime]:
+    """Parse an HTTP date. Return an aware datetime or None if the
+    value is invalid.
+    """
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date
+
+
+def http_date(value: t.Union[datetime, float, int]) -> str:
+    """Format a datetime or a timestamp as an HTTP date.
+    Naive datetimes are considered to be UTC.
+    """
+    if not isinstance(value, datetime):
+        value = datetime.fromtimestamp(value, timezone.utc)
+    elif value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def parse_range(value: str, size: int) -> t.Optional[
+        t.List[t.Tuple[int, int]]]:
+    """Parse a bytes Range header, for a representation of `size`
+    bytes. Return the satisfiable ranges as (start, end) pairs, end
+    excluded, or None if the header is invalid and must be ignored.
+    An empty list means that no range is satisfiable.
+    """
+    unit, _, specs = value.partition('=')
+    if unit.strip().lower() != 'bytes' or not specs.strip():
+        return None
+    ranges = []
+    for spec in specs.split(','):
+        if not (spec := spec.strip()):
+            continue
+        first, dash, last = spec.partition('-')
+        if not dash:
+            return None
+        first, last = first.strip(), last.strip()
+        if not first:
+            # suffix range: the last N bytes.
+            if not last.isdigit():
+                return None
+            if (length := int(last)) and size:
+                ranges.append((max(size - length, 0), size))
+            continue
+        if not first.isdigit() or (last and not last.isdigit()):
+            return None
+        start = int(first)
+        if last:
+            if (end := int(last) + 1) <= start:
+                return None
+        else:
+            end = size
+        if start < size:
+            ranges.append((start, min(end, size)))
+    return ranges
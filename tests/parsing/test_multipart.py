@@ -1,7 +1,11 @@
+import base64
+import hashlib
 import pytest
 from io import BytesIO
+from tempfile import SpooledTemporaryFile
 from webtest.app import TestApp as App
-from horseman.parsers import parser
+from horseman.parsers import parser, multipart_stream
+from horseman.parsers.multipart import Multipart
 from horseman.exceptions import HTTPError
 
 
@@ -109,6 +113,8 @@ def test_multipart_files():
     )
 
     data = parser.parse(BytesIO(body), content_type)
+    assert data.form.get('test') == 'some value'
+    assert len(data.form.getlist('files')) == 2
     uploaded = data.form[1:]
     assert len(uploaded) == 2
     name, obj = uploaded[0]
@@ -144,3 +150,289 @@ def test_wrong_multipart_no_content_disposition():
 
     assert exc.value.status == 400
     assert exc.value.body == ('Unparsable multipart body.')
+
+
+def test_multipart_spooling():
+    app = App(None)
+    content_type, body = app.encode_multipart(
+        [], [('small', "small.txt", b'abc', 'text/plain'),
+             ('large', "large.bin", b'x' * 2048, 'application/octet')]
+    )
+    Multipart.SPOOL_THRESHOLD, default = 1024, Multipart.SPOOL_THRESHOLD
+    try:
+        data = parser.parse(BytesIO(body), content_type)
+    finally:
+        Multipart.SPOOL_THRESHOLD = default
+
+    (_, small), (_, large) = data.form
+    assert isinstance(small, SpooledTemporaryFile)
+    assert not small._rolled
+    assert small.size == 3
+    assert small.read() == b'abc'
+    assert large._rolled
+    assert large.size == 2048
+    assert large.filename == 'large.bin'
+    assert large.content_type == b'application/octet'
+    assert large.params[b'name'] == b'large'
+    assert large.read() == b'x' * 2048
+
+
+def test_multipart_custom_storage():
+    app = App(None)
+    content_type, body = app.encode_multipart(
+        [], [('file', "test.txt", b'abc', 'text/plain')])
+    streams = []
+
+    def storage():
+        streams.append(BytesIO())
+        return streams[-1]
+
+    form = Multipart(f";{content_type.split('; ', 1)[1]}", storage=storage)
+    form.feed_data(body)
+    assert form.form == [('file', streams[0])]
+    assert streams[0].read() == b'abc'
+
+
+def test_multipart_size_caps():
+    app = App(None)
+    content_type, body = app.encode_multipart(
+        [('field', 'value')],
+        [('file', "test.txt", b'x' * 100, 'text/plain')]
+    )
+    boundary = f";{content_type.split('; ', 1)[1]}"
+
+    form = Multipart(boundary, max_part_size=99)
+    with pytest.raises(HTTPError) as exc:
+        form.feed_data(body)
+    assert exc.value.status == 413
+    assert exc.value.body == 'File part exceeds 99 bytes.'
+
+    form = Multipart(boundary, max_size=104)
+    with pytest.raises(HTTPError) as exc:
+        form.feed_data(body)
+    assert exc.value.status == 413
+    assert exc.value.body == 'Body exceeds 104 bytes.'
+
+    form = Multipart(boundary, max_num_fields=1)
+    with pytest.raises(HTTPError) as exc:
+        form.feed_data(body)
+    assert exc.value.status == 413
+    assert exc.value.body == 'Form exceeds 1 fields.'
+
+    form = Multipart(
+        boundary, max_part_size=100, max_size=105, max_num_fields=2)
+    form.feed_data(body)
+    assert len(form.form) == 2
+
+    Multipart.MAX_SIZE = 10
+    try:
+        with pytest.raises(HTTPError) as exc:
+            parser.parse(BytesIO(body), content_type)
+        assert exc.value.status == 413
+    finally:
+        Multipart.MAX_SIZE = None
+
+
+def test_multipart_text_fields():
+    app = App(None)
+    content_type, body = app.encode_multipart(
+        [('field', 'café ' * 1000), ('empty', '')], [])
+    boundary = f";{content_type.split('; ', 1)[1]}"
+
+    # Multibyte characters split across chunks are decoded as a whole.
+    form = Multipart(boundary)
+    for index in range(0, len(body), 7):
+        form.feed_data(body[index:index + 7])
+    assert form.form == [('field', 'café ' * 1000)]
+
+    content_type, body = app.encode_multipart(
+        [('field', 'café'.encode('latin-1'))], [])
+    boundary = f";{content_type.split('; ', 1)[1]}"
+    form = Multipart(boundary, charset='latin-1')
+    form.feed_data(body)
+    assert form.form == [('field', 'café')]
+
+    form = Multipart(boundary, max_field_size=3)
+    with pytest.raises(HTTPError) as exc:
+        form.feed_data(body)
+    assert exc.value.status == 413
+    assert exc.value.body == 'Field exceeds 3 bytes.'
+
+    with pytest.raises(HTTPError) as exc:
+        parser.parse(BytesIO(body), content_type)
+    assert exc.value.status == 400
+    assert exc.value.body == 'Unparsable multipart body.'
+
+    data = parser.parse(BytesIO(body), f'{content_type}; charset=latin-1')
+    assert data.form == [('field', 'café')]
+
+
+def test_multipart_digests():
+    data = b'x' * 20000
+    sha256 = hashlib.sha256(data)
+    md5 = base64.b64encode(hashlib.md5(data).digest()).decode()
+    boundary = ';boundary=foo'
+
+    def body(*headers):
+        return (
+            b'--foo\r\n'
+            b'Content-Disposition: form-data; name="file"; '
+            b'filename="test.txt"\r\n'
+            b'Content-Type: text/plain\r\n' +
+            b''.join(header + b'\r\n' for header in headers) +
+            b'\r\n' + data + b'\r\n--foo--\r\n'
+        )
+
+    form = Multipart(boundary, digests=('sha256',))
+    payload = body()
+    for index in range(0, len(payload), 4096):
+        form.feed_data(payload[index:index + 4096])
+    assert form.form[0][1].digests == {'sha256': sha256.hexdigest()}
+
+    # Declared digests are only checked on demand.
+    form = Multipart(boundary)
+    form.feed_data(body(b'Content-MD5: ' + b'A' * 24))
+    assert form.form[0][1].digests == {}
+
+    form = Multipart(boundary, verify=True)
+    form.feed_data(body(
+        b'Content-MD5: ' + md5.encode(),
+        b'Content-Digest: sha-256=:' +
+        base64.b64encode(sha256.digest()) + b':'
+    ))
+    assert form.form[0][1].digests == {
+        'md5': hashlib.md5(data).hexdigest(),
+        'sha256': sha256.hexdigest()
+    }
+
+    form = Multipart(boundary, verify=True)
+    with pytest.raises(HTTPError) as exc:
+        form.feed_data(body(b'Digest: SHA-256=' + b'A' * 43 + b'='))
+    assert exc.value.status == 400
+    assert exc.value.body == "sha256 digest mismatch for part 'file'."
+
+
+def test_multipart_stream():
+    app = App(None)
+    content_type, body = app.encode_multipart(
+        [('field', 'dédé')],
+        [('file', "test.txt", b'x' * 20000, 'text/plain'),
+         ('skipped', "skipped.bin", b'y' * 20000, 'application/octet'),
+         ('last', "last.bin", b'z' * 10, 'application/octet')]
+    )
+    stream = BytesIO(body)
+    parts = multipart_stream(stream, content_type, chunk_size=1024)
+
+    part = next(parts)
+    assert part.name == 'field'
+    assert not part.is_file
+    assert part.value == 'dédé'
+    assert stream.tell() < len(body)
+
+    part = next(parts)
+    assert part.name == 'file'
+    assert part.filename == 'test.txt'
+    assert part.content_type == b'text/plain'
+    assert part.stream.read(5) == b'xxxxx'
+    assert stream.tell() < 20000
+    assert part.stream.read() == b'x' * 19995
+    assert part.stream.read() == b''
+
+    part = next(parts)
+    assert part.name == 'skipped'
+
+    part = next(parts)
+    assert part.name == 'last'
+    assert part.stream.read() == b'z' * 10
+
+    with pytest.raises(StopIteration):
+        next(parts)
+
+
+def test_multipart_stream_errors():
+    with pytest.raises(HTTPError) as exc:
+        multipart_stream(BytesIO(b'test'), "multipart/form-data")
+    assert exc.value.status == 400
+
+    with pytest.raises(HTTPError) as exc:
+        list(multipart_stream(
+            BytesIO(BAD_MULTIPART), "multipart/form-data; boundary=--foo"))
+    assert exc.value.status == 400
+    assert exc.value.body == 'Unparsable multipart body.'
+
+    app = App(None)
+    content_type, body = app.encode_multipart(
+        [], [('file', "test.txt", b'x' * 100, 'text/plain')])
+    parts = multipart_stream(
+        BytesIO(body), content_type, chunk_size=16, max_size=50)
+    part = next(parts)
+    with pytest.raises(HTTPError) as exc:
+        part.stream.read()
+    assert exc.value.status == 413
+
+
+def test_multipart_stream_truncated():
+    headers = (
+        b'--foo\r\n'
+        b'Content-Disposition: form-data; name="file"; '
+        b'filename="test.txt"\r\n'
+        b'Content-Type: text/plain\r\n\r\n'
+    )
+    parts = multipart_stream(
+        BytesIO(headers + b'x' * 20000),
+        'multipart/form-data; boundary=foo', chunk_size=1024)
+    part = next(parts)
+    with pytest.raises(HTTPError) as exc:
+        part.stream.read()
+    assert exc.value.status == 400
+    assert exc.value.body == 'Truncated multipart body.'
+
+    # Complete parts, but no closing boundary.
+    parts = multipart_stream(
+        BytesIO(headers + b'abc\r\n--foo\r\n'),
+        'multipart/form-data; boundary=foo')
+    part = next(parts)
+    assert part.stream.read() == b'abc'
+    with pytest.raises(HTTPError) as exc:
+        next(parts)
+    assert exc.value.status == 400
+
+
+def test_multipart_stream_field_size():
+    app = App(None)
+    content_type, body = app.encode_multipart(
+        [('short', 'abc'), ('long', 'x' * 100)], [])
+    parts = multipart_stream(
+        BytesIO(body), content_type, chunk_size=16, max_field_size=50)
+    assert next(parts).value == 'abc'
+    with pytest.raises(HTTPError) as exc:
+        next(parts)
+    assert exc.value.status == 413
+    assert exc.value.body == 'Field exceeds 50 bytes.'
+
+    Multipart.MAX_FIELD_SIZE = 50
+    try:
+        with pytest.raises(HTTPError):
+            list(multipart_stream(BytesIO(body), content_type))
+    finally:
+        Multipart.MAX_FIELD_SIZE = None
+
+
+def test_multipart_truncated(monkeypatch):
+    streams = []
+
+    def spool(self):
+        streams.append(SpooledTemporaryFile())
+        return streams[-1]
+
+    monkeypatch.setattr(Multipart, 'spool', spool)
+    app = App(None)
+    content_type, body = app.encode_multipart(
+        [('field', 'value')],
+        [('file', "test.txt", b'x' * 1000, 'text/plain')]
+    )
+    with pytest.raises(HTTPError) as exc:
+        parser.parse(BytesIO(body[:-300]), content_type)
+    assert exc.value.status == 400
+    assert exc.value.body == 'Truncated multipart body.'
+    assert streams[0].closed  # the unfinished file part.
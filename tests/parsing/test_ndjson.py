@@ -0,0 +1,56 @@
+import pytest
+from io import BytesIO
+from horseman.exceptions import HTTPError, ParsingException
+from horseman.parsers import (
+    parser, iter_ndjson, iter_ndjson_batches, ndjson_parser)
+
+
+NDJSON = b'{"id": 1}\n{"id": 2}\n\n  \n{"id": 3, "name": "\xc3\xa9"}\n'
+
+
+def test_ndjson():
+    data = parser.parse(BytesIO(NDJSON), 'application/x-ndjson')
+    assert data.form is None
+    assert list(data.json) == [{'id': 1}, {'id': 2}, {'id': 3, 'name': 'é'}]
+
+
+def test_ndjson_no_trailing_newline():
+    records = iter_ndjson(BytesIO(b'1\r\n[2]\r\n"three"'))
+    assert list(records) == [1, [2], 'three']
+
+
+def test_ndjson_lines_across_chunks():
+    body = b''.join(b'{"value": "%s"}\n' % (b'x' * n) for n in range(50))
+    records = list(iter_ndjson(BytesIO(body), chunk_size=7))
+    assert records == [{'value': 'x' * n} for n in range(50)]
+
+
+def test_ndjson_charset():
+    body = BytesIO('{"name": "Älfùr"}\n'.encode('latin-1'))
+    data = ndjson_parser(body, 'application/x-ndjson', charset='latin-1')
+    assert list(data.json) == [{'name': 'Älfùr'}]
+
+
+def test_ndjson_batches():
+    body = BytesIO(b''.join(b'%d\n' % n for n in range(10)))
+    assert list(iter_ndjson_batches(body, 4)) == [
+        [0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_ndjson_malformed_line():
+    records = iter_ndjson(BytesIO(b'{"id": 1}\n\n{"id": \n{"id": 3}\n'))
+    assert next(records) == {'id': 1}
+    with pytest.raises(ParsingException) as exc:
+        next(records)
+    assert str(exc.value).startswith('Line 3: ')
+
+
+def test_ndjson_parser_malformed_line():
+    data = parser.parse(
+        BytesIO(b'{"id": 1}\n \t\r\n{"id": \n'), 'application/x-ndjson')
+    records = iter(data.json)
+    assert next(records) == {'id': 1}
+    with pytest.raises(HTTPError) as exc:
+        next(records)
+    assert exc.value.status == 400
+    assert exc.value.body.startswith('Line 3: ')
@@ -1,5 +1,7 @@
 import pytest
 from io import BytesIO
+from horseman.datastructures import Form
+from horseman.exceptions import HTTPError
 from horseman.parsers import Data, urlencoded_parser
 
 
@@ -51,3 +53,22 @@ def test_wrong_urlencoded():
     with pytest.raises(ValueError) as exc:
         urlencoded_parser(body, 'application/x-www-form-urlencoded')
     assert str(exc.value) == "bad query field: 'foo'"
+
+
+def test_urlencoded_max_num_fields():
+    body = b'a=1&b=2&a=3'
+    Form.MAX_NUM_FIELDS = 2
+    try:
+        with pytest.raises(HTTPError) as exc:
+            urlencoded_parser(
+                BytesIO(body), 'application/x-www-form-urlencoded')
+        assert exc.value.status == 413
+        assert exc.value.body == 'Form exceeds 2 fields.'
+
+        Form.MAX_NUM_FIELDS = 3
+        data = urlencoded_parser(
+            BytesIO(body), 'application/x-www-form-urlencoded')
+    finally:
+        Form.MAX_NUM_FIELDS = None
+    assert isinstance(data.form, Form)
+    assert data.form.getlist('a') == ('1', '3')
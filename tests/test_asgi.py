@@ -0,0 +1,189 @@
+import asyncio
+import pytest
+from horseman.asgi import (
+    ASGIAdapter, ASGIEnviron, BodyStream, content_length)
+from horseman.environ import WSGIEnvironWrapper
+from horseman.exceptions import HTTPError
+from horseman.mapping import Mapping
+from horseman.response import Response
+
+
+def scope(path='/', method='GET', query_string=b'', headers=()):
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'root_path': '',
+        'query_string': query_string,
+        'headers': list(headers),
+        'server': ('testserver', 8000),
+        'client': ('127.0.0.1', 5000),
+    }
+
+
+def call(app, scope, messages=()):
+    received = list(messages) or [{'type': 'http.request'}]
+    sent = []
+
+    async def receive():
+        return received.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+
+def echo(environ, start_response):
+    request = WSGIEnvironWrapper(environ)
+    body = repr((
+        request.method, request.path, request['QUERY_STRING'],
+        request.get('HTTP_X_TEST'), request.data.form
+    ))
+    return Response(body=body)(environ, start_response)
+
+
+def test_asgi_environ():
+    environ = ASGIEnviron(scope(
+        '/café', query_string=b'a=1',
+        headers=[(b'content-type', b'text/plain'),
+                 (b'x-test', b'a'), (b'X-Test', b'b'),
+                 (b'cookie', b'a=1'), (b'cookie', b'b=2')]
+    ), None)
+    assert not environ._environ.keys() & {'PATH_INFO', 'HTTP_X_TEST'}
+    assert environ['PATH_INFO'] == '/café'.encode().decode('latin-1')
+    assert 'HTTP_X_TEST' not in environ._environ
+    assert environ['HTTP_X_TEST'] == 'a,b'
+    assert environ['HTTP_COOKIE'] == 'a=1; b=2'
+    assert environ['CONTENT_TYPE'] == 'text/plain'
+    assert environ.get('CONTENT_LENGTH') is None
+    assert environ['SERVER_PORT'] == '8000'
+
+    del environ['QUERY_STRING']
+    assert 'QUERY_STRING' not in environ
+    environ['SCRIPT_NAME'] = '/app'
+    assert environ['SCRIPT_NAME'] == '/app'
+    assert set(environ) >= {'REQUEST_METHOD', 'REMOTE_ADDR', 'wsgi.input'}
+    assert len(environ) == len(list(environ))
+
+
+def test_asgi_mapping():
+    app = ASGIAdapter(Mapping({'/echo': echo}))
+    sent = call(app, scope(
+        '/echo/path', query_string=b'q=1', headers=[(b'x-test', b'ok')]))
+    assert sent[0] == {
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'Content-Type', b'text/plain; charset=utf-8'),
+            (b'Content-Length', b'35'),
+        ]
+    }
+    assert b''.join(message.get('body', b'') for message in sent[1:]) == (
+        b"('GET', '/path', 'q=1', 'ok', None)")
+    assert sent[-1]['more_body'] is False
+
+    sent = call(app, scope('/nowhere'))
+    assert sent[0]['status'] == 404
+
+
+def test_asgi_body():
+    app = ASGIAdapter(echo)
+    headers = [(b'content-type', b'application/x-www-form-urlencoded')]
+    messages = [
+        {'type': 'http.request', 'body': b'a=1&', 'more_body': True},
+        {'type': 'http.request', 'body': b'', 'more_body': True},
+        {'type': 'http.request', 'body': b'b=2'},
+    ]
+    sent = call(app, scope(method='POST', headers=headers), messages)
+    assert sent[1]['body'].endswith(b"Form([('a', '1'), ('b', '2')]))")
+
+    app = ASGIAdapter(echo, max_body_size=5)
+    messages = [
+        {'type': 'http.request', 'body': b'a=1&', 'more_body': True},
+        {'type': 'http.request', 'body': b'b=2'},
+    ]
+    sent = call(app, scope(method='POST', headers=headers), messages)
+    assert sent[0]['status'] == 413
+    assert sent[1]['body'] == b'Body exceeds 5 bytes.'
+
+    sent = call(app, scope(
+        method='POST', headers=headers + [(b'content-length', b'7')]))
+    assert sent[0]['status'] == 413
+
+    sent = call(app, scope(
+        method='POST', headers=headers + [(b'content-length', b'x')]))
+    assert sent[0]['status'] == 400
+
+    messages = [
+        {'type': 'http.request', 'body': b'a=1&', 'more_body': True},
+        {'type': 'http.disconnect'},
+    ]
+    assert call(ASGIAdapter(echo), scope(method='POST'), messages) == []
+
+
+def test_asgi_body_spooled_to_disk():
+    messages = [
+        {'type': 'http.request', 'body': b'a=1&', 'more_body': True},
+        {'type': 'http.request', 'body': b'b=2&', 'more_body': True},
+        {'type': 'http.request', 'body': b'c=3'},
+    ]
+    headers = [(b'content-type', b'application/x-www-form-urlencoded')]
+    BodyStream.SPOOL_THRESHOLD = 6
+    try:
+        sent = call(
+            ASGIAdapter(echo), scope(method='POST', headers=headers),
+            messages)
+    finally:
+        BodyStream.SPOOL_THRESHOLD = 1024 * 1024
+    assert sent[1]['body'].endswith(
+        b"Form([('a', '1'), ('b', '2'), ('c', '3')]))")
+
+
+def test_asgi_content_length():
+    assert content_length(scope()) is None
+    assert content_length(scope(headers=[
+        (b'x-test', b'ok'), (b'Content-Length', b'12')])) == 12
+    with pytest.raises(HTTPError):
+        content_length(scope(headers=[(b'content-length', b'x')]))
+
+
+def test_asgi_streaming():
+    closed = []
+
+    def chunks():
+        try:
+            yield b'a'
+            yield b''
+            yield b'b'
+        finally:
+            closed.append(True)
+
+    def app(environ, start_response):
+        write = start_response('200 OK', [('Content-Type', 'text/plain')])
+        write(b'0')
+        return chunks()
+
+    sent = call(ASGIAdapter(app, max_workers=1), scope())
+    assert sent[0]['headers'] == [(b'Content-Type', b'text/plain')]
+    assert [message.get('body') for message in sent[1:]] == [
+        b'0', b'a', b'b', None]
+    assert closed == [True]
+
+
+def test_asgi_lifespan():
+    messages = [
+        {'type': 'lifespan.startup'},
+        {'type': 'lifespan.shutdown'}
+    ]
+    sent = call(ASGIAdapter(echo), {'type': 'lifespan'}, messages)
+    assert sent == [
+        {'type': 'lifespan.startup.complete'},
+        {'type': 'lifespan.shutdown.complete'}
+    ]
+
+    with pytest.raises(ValueError):
+        call(ASGIAdapter(echo), {'type': 'websocket'})
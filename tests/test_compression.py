@@ -0,0 +1,170 @@
+import gzip
+import zlib
+from unittest.mock import Mock
+from wsgiref.util import FileWrapper
+from horseman.compression import Compression, negotiate, compressible
+from horseman.mapping import Mapping
+from horseman.response import Response, FileResponse
+
+
+JSON = b'{"name": "horseman", "tags": ["wsgi", "toolkit"]}' * 50
+
+
+class App:
+    """Minimal client: no content decoding is done."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def get(self, path, headers=None):
+        environ = {'PATH_INFO': path, 'SCRIPT_NAME': ''}
+        for name, value in (headers or {}).items():
+            environ['HTTP_' + name.upper().replace('-', '_')] = value
+        captured = {}
+
+        def start_response(status, headers, exc_info=None):
+            captured['status'] = status
+            captured['headers'] = dict(headers)
+
+        iterable = self.app(environ, start_response)
+        body = b''.join(iterable)
+        iterable.close()
+        return captured['headers'], body
+
+
+def test_negotiate():
+    assert negotiate('') is None
+    assert negotiate('gzip') == 'gzip'
+    assert negotiate('deflate, gzip') == 'gzip'
+    assert negotiate('gzip;q=0.5, deflate') == 'deflate'
+    assert negotiate('gzip;q=0, deflate;q=0') is None
+    assert negotiate('br, *') == 'gzip'
+    assert negotiate('*;q=0.1, gzip;q=0') == 'deflate'
+    assert negotiate('identity') is None
+    assert negotiate('gzip;q=foo, deflate') == 'deflate'
+
+
+def test_compressible():
+    assert compressible(None)
+    assert compressible('application/json; charset=utf-8')
+    assert compressible('image/svg+xml')
+    assert not compressible('image/png')
+    assert not compressible('application/zip')
+
+
+def test_compress_bytes_body():
+    app = App(Compression(Response(
+        body=JSON, headers={'Content-Type': 'application/json'})))
+
+    headers, body = app.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert headers['Content-Encoding'] == 'gzip'
+    assert headers['Vary'] == 'Accept-Encoding'
+    assert int(headers['Content-Length']) < len(JSON)
+    assert gzip.decompress(body) == JSON
+
+    headers, body = app.get('/', headers={'Accept-Encoding': 'deflate'})
+    assert headers['Content-Encoding'] == 'deflate'
+    assert zlib.decompress(body) == JSON
+
+    headers, body = app.get('/')
+    assert 'Content-Encoding' not in headers
+    assert headers['Vary'] == 'Accept-Encoding'
+    assert body == JSON
+
+
+def test_compress_cache():
+    compression = Compression(Response(
+        body=JSON, headers={'Content-Type': 'application/json'}))
+    app = App(compression)
+    app.get('/', headers={'Accept-Encoding': 'gzip'})
+    app.get('/', headers={'Accept-Encoding': 'gzip'})
+    info = compression._compress.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+
+
+def test_compress_stream():
+    def chunks():
+        for _ in range(100):
+            yield JSON[:100]
+
+    def streaming(environ, start_response):
+        return Response(
+            body=chunks(), headers={'Content-Type': 'text/plain'}
+        )(environ, start_response)
+
+    app = App(Compression(Mapping({'/': streaming})))
+    headers, body = app.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in headers
+    assert gzip.decompress(body) == JSON[:100] * 100
+
+
+def test_compress_skipped():
+    app = App(Compression(Response(
+        body=b'small', headers={'Content-Type': 'text/plain'})))
+    headers, body = app.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in headers
+    assert headers['Vary'] == 'Accept-Encoding'
+    assert body == b'small'
+
+    app = App(Compression(Response(
+        body=JSON, headers={'Content-Type': 'image/png'})))
+    headers, body = app.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in headers
+    assert 'Vary' not in headers
+    assert body == JSON
+
+    app = App(Compression(Response(
+        body=JSON, headers={
+            'Content-Type': 'text/plain', 'Content-Encoding': 'br'})))
+    headers, body = app.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert headers['Content-Encoding'] == 'br'
+    assert body == JSON
+
+
+def test_compress_vary_merge():
+    app = App(Compression(Response(
+        body=JSON, headers={'Content-Type': 'text/plain', 'Vary': 'Origin'})))
+    headers, body = app.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert headers['Vary'] == 'Origin, Accept-Encoding'
+
+
+def test_compress_keeps_file_wrapper(tmp_path):
+    path = tmp_path / 'image.png'
+    path.write_bytes(JSON)
+    response = FileResponse(path)
+    app = Compression(Mapping({'/image': response}))
+    iterable = app(
+        {'SCRIPT_NAME': '', 'PATH_INFO': '/image',
+         'HTTP_ACCEPT_ENCODING': 'gzip',
+         'wsgi.file_wrapper': FileWrapper},
+        Mock()
+    )
+    assert isinstance(iterable, FileWrapper)
+    assert iterable.filelike is response
+    assert b''.join(iterable) == JSON
+    iterable.close()
+    assert response.body.closed
+
+    # No negotiated encoding: the file wrapper is kept as well.
+    path = tmp_path / 'test.txt'
+    path.write_bytes(JSON)
+    start_response = Mock()
+    iterable = Compression(FileResponse(path))(
+        {'PATH_INFO': '/', 'wsgi.file_wrapper': FileWrapper},
+        start_response)
+    assert isinstance(iterable, FileWrapper)
+    assert ('Vary', 'Accept-Encoding') in start_response.call_args[0][1]
+    iterable.close()
+
+
+def test_compress_lazy_start():
+    def lazy(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        yield JSON
+
+    app = App(Compression(lazy))
+    headers, body = app.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(body) == JSON
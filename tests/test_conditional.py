@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from http import HTTPStatus
+from unittest.mock import Mock
+from webtest.app import TestRequest as Request
+from horseman.environ import WSGIEnvironWrapper
+from horseman.response import (
+    ETAG_CACHE_MAX_SIZE, Response, compute_etag, _cached_etag)
+from horseman.utils import parse_etags, weak_etag_match, http_date
+
+
+MODIFIED = datetime(2026, 3, 24, 12, 30, tzinfo=timezone.utc)
+
+
+def test_parse_etags():
+    assert parse_etags('') == ()
+    assert parse_etags(' * ') == ('*',)
+    assert parse_etags('"abc", W/"def"') == ('"abc"', 'W/"def"')
+    assert weak_etag_match('"def"', ('"abc"', 'W/"def"'))
+    assert weak_etag_match('W/"abc"', ('"abc"',))
+    assert not weak_etag_match('"ab"', ('"abc"',))
+
+
+def test_environ_conditional_headers():
+    request = Request.blank('/', headers={
+        'If-None-Match': '"abc", "def"',
+        'If-Modified-Since': http_date(MODIFIED),
+    })
+    environ = WSGIEnvironWrapper(request.environ)
+    assert environ.if_none_match == ('"abc"', '"def"')
+    assert environ.if_modified_since == MODIFIED
+
+    environ = WSGIEnvironWrapper(Request.blank('/', headers={
+        'If-Modified-Since': 'not a date'}).environ)
+    assert environ.if_none_match == ()
+    assert environ.if_modified_since is None
+
+
+def test_etag_computation():
+    response = Response(body='Super').conditional({})
+    assert response.status == HTTPStatus.OK
+    assert response.headers['ETag'] == compute_etag(b'Super')
+    assert compute_etag(b'Super').startswith('"')
+
+    response = Response(body=iter([b'Super'])).conditional({})
+    assert 'ETag' not in response.headers
+
+    response = Response(body=iter([b'Super'])).conditional({}, etag='v1')
+    assert response.headers['ETag'] == '"v1"'
+
+    response = Response(404).conditional({})
+    assert 'ETag' not in response.headers
+
+
+def test_etag_cache_bounded():
+    _cached_etag.cache_clear()
+    large = b'x' * (ETAG_CACHE_MAX_SIZE + 1)
+    assert compute_etag(large) == compute_etag(bytes(large))
+    assert _cached_etag.cache_info().currsize == 0
+    compute_etag(b'Super')
+    assert _cached_etag.cache_info().currsize == 1
+
+
+def test_if_none_match():
+    etag = compute_etag(b'Super')
+    start_response = Mock()
+
+    response = Response(body='Super').conditional({
+        'HTTP_IF_NONE_MATCH': f'"other", W/{etag}'})
+    assert response.status == HTTPStatus.NOT_MODIFIED
+    assert list(response({}, start_response)) == []
+    start_response.assert_called_with(
+        '304 Not Modified', [('ETag', etag)])
+
+    response = Response(body='Super').conditional({
+        'HTTP_IF_NONE_MATCH': '"other"'})
+    assert response.status == HTTPStatus.OK
+
+    response = Response(body='Super').conditional({
+        'HTTP_IF_NONE_MATCH': '*', 'REQUEST_METHOD': 'PUT'})
+    assert response.status == HTTPStatus.PRECONDITION_FAILED
+
+
+def test_if_modified_since():
+    def response():
+        return Response(body=iter([b'Super']))
+
+    environ = {'HTTP_IF_MODIFIED_SINCE': http_date(MODIFIED)}
+    assert response().conditional(
+        environ, last_modified=MODIFIED).status == HTTPStatus.NOT_MODIFIED
+    assert response().conditional(
+        environ, last_modified=MODIFIED.timestamp() + 1
+    ).status == HTTPStatus.OK
+    assert response().conditional(environ).status == HTTPStatus.OK
+
+    # If-None-Match takes precedence.
+    environ['HTTP_IF_NONE_MATCH'] = '"other"'
+    assert response().conditional(
+        environ, etag='v1', last_modified=MODIFIED
+    ).status == HTTPStatus.OK
@@ -1,3 +1,4 @@
+import pytest
 from horseman.datastructures import ContentType
 
 
@@ -24,3 +25,41 @@ def test_idempotency():
     )
     ct = ContentType(header)
     assert ContentType(ct) is ct
+
+
+def test_interning():
+    from horseman.datastructures import MediaType
+
+    ct = ContentType('application/json; charset=UTF-8')
+    assert ContentType('application/json; charset=UTF-8') is ct
+    assert ContentType('application/json;charset=UTF-8') == ct
+
+    media = MediaType('application/json; charset=UTF-8')
+    assert isinstance(media, MediaType)
+    assert media is not ct
+    assert media.subtype == 'json'
+    assert MediaType('application/json; charset=UTF-8') is media
+
+
+def test_interned_immutability():
+    from horseman.datastructures import MediaType
+
+    for instance in (ContentType('text/html'), MediaType('text/html')):
+        with pytest.raises(AttributeError):
+            instance.options = {'charset': 'latin-1'}
+        with pytest.raises(AttributeError):
+            instance.mimetype = 'text/plain'
+        with pytest.raises(AttributeError):
+            del instance.options
+        assert instance.mimetype == 'text/html'
+        assert instance.options == {}
+
+
+def test_parse_header():
+    from horseman.utils import parse_header
+
+    assert parse_header(' text/plain ;Charset= utf-8;;flag; a=b=c') == (
+        'text/plain', {'charset': 'utf-8', 'a': 'b=c'})
+    assert parse_header('text/plain; name="a;b\\"c"; x=1') == (
+        'text/plain', {'name': 'a;b"c', 'x': '1'})
+    assert parse_header('') == ('', {})
@@ -13,3 +13,29 @@ def test_request_parse_cookies():
     # No cookie
     cookies = Cookies.from_string("")
     assert not cookies
+
+
+def test_request_cookies():
+    from horseman.datastructures import RequestCookies
+
+    cookies = RequestCookies(
+        'sid=old; _ga=GA1.2.3; asid=x; sid = abc%20def ; theme=dark')
+    assert cookies['sid'] == 'abc def'
+    assert cookies['theme'] == 'dark'
+    assert cookies.get('id') is None
+    assert 'asid' in cookies
+    assert 'GA1' not in cookies
+    assert cookies._cookies is None  # nothing was fully parsed.
+
+    assert dict(cookies) == {
+        'sid': 'abc def', '_ga': 'GA1.2.3', 'asid': 'x', 'theme': 'dark'}
+    assert len(cookies) == 4
+    assert cookies._cookies is not None
+
+    # Quoted values can hide separators: the header is fully parsed.
+    cookies = RequestCookies('a="x; b=1"; b=2')
+    assert cookies['a'] == 'x; b=1'
+    assert cookies['b'] == '2'
+
+    assert RequestCookies() == {}
+    assert RequestCookies('a=1') == Cookies.from_string('a=1')
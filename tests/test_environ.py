@@ -39,3 +39,69 @@ def test_environ_immutability():
     del environ.path
     environ._environ['PATH_INFO'] = '/test'
     assert environ.path == '/test'
+
+
+def test_environ_body_recording():
+    # The body is still readable once parsed.
+    request = Request.blank('/', method='POST', POST={'field': 'value'})
+    environ = WSGIEnvironWrapper(request.environ)
+    assert environ.data.form == [('field', 'value')]
+    assert environ.body.read() == b'field=value'
+
+    request = Request.blank('/', method='POST', POST={'field': 'value'})
+    environ = WSGIEnvironWrapper(request.environ)
+    assert environ.body.read() == b'field=value'
+    assert environ.data.form == [('field', 'value')]
+    assert environ.body.read() == b'field=value'
+    other = WSGIEnvironWrapper(request.environ)
+    assert other.data.form == [('field', 'value')]
+
+
+def test_environ_body_not_recorded():
+    class Unrecorded(WSGIEnvironWrapper):
+        record_body = False
+
+    request = Request.blank('/', method='POST', POST={'field': 'value'})
+    environ = Unrecorded(request.environ)
+    assert environ.data.form == [('field', 'value')]
+    assert not environ.body.seekable()
+    assert environ.body.read() == b''
+
+
+def test_slotted_request():
+    from horseman.environ import Request as SlottedRequest
+
+    request = Request.blank(
+        '/path?key=1', method='POST', POST={'field': 'value'},
+        headers={'Cookie': 'sid=abc', 'Accept': 'text/html'})
+    environ = SlottedRequest(request.environ)
+    wrapper = WSGIEnvironWrapper(request.environ)
+    assert not hasattr(environ, '__dict__')
+    assert environ == wrapper._environ
+
+    for name in (
+            'method', 'path', 'query', 'script_name', 'domain', 'accept',
+            'content_type', 'if_none_match', 'if_modified_since',
+            'application_uri', 'params'):
+        assert getattr(environ, name) == getattr(wrapper, name)
+    assert environ.cookies['sid'] == 'abc'
+    assert environ.data.form == [('field', 'value')]
+    assert environ.data is environ.data
+    assert environ.uri() == wrapper.uri()
+    assert environ['REQUEST_METHOD'] == 'POST'
+    assert environ.get('HTTP_MISSING', 'default') == 'default'
+    assert 'PATH_INFO' in environ
+    assert len(environ) == len(wrapper)
+
+    with pytest.raises(AttributeError):
+        environ.path = '/test'
+    with pytest.raises(NotImplementedError):
+        environ['PATH_INFO'] = '/test'
+    del environ.path
+    environ._environ['PATH_INFO'] = '/test'
+    assert environ.path == '/test'
+
+    with pytest.raises(TypeError):
+        SlottedRequest(environ)
+    with pytest.raises(TypeError):
+        WSGIEnvironWrapper(environ)
@@ -0,0 +1,45 @@
+import pytest
+from horseman.datastructures import Form
+
+
+def test_form():
+    form = Form([('name', 'MacBeth'), ('thane', 'Cawdor'),
+                 ('thane', 'Glamis'), ('age', '42'), ('king', 'no')])
+    assert len(form) == 5
+    assert form == [
+        ('name', 'MacBeth'), ('thane', 'Cawdor'), ('thane', 'Glamis'),
+        ('age', '42'), ('king', 'no')
+    ]
+    assert form == Form(form)
+    assert form != [('name', 'MacBeth')]
+    assert form[0] == ('name', 'MacBeth')
+    assert form[-1] == ('king', 'no')
+    assert form[1:3] == [('thane', 'Cawdor'), ('thane', 'Glamis')]
+    assert list(form.names()) == ['name', 'thane', 'age', 'king']
+    assert dict(form) == {
+        'name': 'MacBeth', 'thane': 'Glamis', 'age': '42', 'king': 'no'}
+    assert dict(Form([('a', '1')])) == {'a': '1'}
+
+    assert 'thane' in form
+    assert ('thane', 'Glamis') in form
+    assert 'lady' not in form
+
+    assert form['thane'] == ('Cawdor', 'Glamis')
+    with pytest.raises(KeyError):
+        form['lady']
+    assert form.get('thane') == 'Cawdor'
+    assert form.get('lady') is None
+    assert form.get('lady', 'Macbeth') == 'Macbeth'
+    assert form.getlist('thane') == ('Cawdor', 'Glamis')
+    assert form.getlist('lady') == ()
+
+    assert form.as_int('age') == 42
+    assert form.as_float('age') == 42.0
+    assert form.as_bool('king') is False
+    with pytest.raises(ValueError):
+        form.as_int('name')
+
+    with pytest.raises(TypeError):
+        hash(form)
+    assert repr(Form([('a', '1')])) == "Form([('a', '1')])"
+    assert Form() == []
@@ -145,15 +145,24 @@ def test_nested_mapping():
     environ = {'SCRIPT_NAME': '', 'PATH_INFO': '/no'}
     node = Mapping({"/some":  Mapping({'/thing': basic_app})})
     body = b"".join(node(environ, start_response))
-    start_response.assert_called_with('404 Not Found', [])
+    start_response.assert_called_with(
+        '404 Not Found', [
+            ('Content-Type', 'text/plain; charset=utf-8'),
+            ('Content-Length', '29'),
+        ])
     assert environ == {'SCRIPT_NAME': '', 'PATH_INFO': '/no'}
     start_response.reset()
 
     environ = {'SCRIPT_NAME': '', 'PATH_INFO': '/some'}
     node = Mapping({"/some":  Mapping({'/thing': basic_app})})
     response = node(environ, start_response)
-    start_response.assert_called_with('404 Not Found', [])
-    assert environ == {'SCRIPT_NAME': '', 'PATH_INFO': '/some'}
+    start_response.assert_called_with(
+        '404 Not Found', [
+            ('Content-Type', 'text/plain; charset=utf-8'),
+            ('Content-Length', '29'),
+        ])
+    # The outer mapping consumed its prefix before the inner 404.
+    assert environ == {'SCRIPT_NAME': '/some', 'PATH_INFO': '/'}
     start_response.reset()
 
     environ = {'SCRIPT_NAME': '', 'PATH_INFO': '/some/thing'}
@@ -161,3 +170,46 @@ def test_nested_mapping():
     response = node(environ, start_response)
     assert list(response) == [b'Hello World!\n']
     assert environ == {'PATH_INFO': '/', 'SCRIPT_NAME': '/some/thing'}
+
+
+def test_mapping_not_found_passes_lint():
+    app = webtest.TestApp(Mapping({}))
+    response = app.get('/', status=404)
+    assert response.content_type == 'text/plain'
+    assert response.body == b'Nothing matches the given URI'
+
+
+def test_mapping_resolve_normalization():
+    node = Mapping({"/": basic_app, "/some/thing": other_app})
+    environ = {'SCRIPT_NAME': '', 'PATH_INFO': '/some//thing/./else/'}
+    assert node.resolve(environ) is other_app
+    assert environ == {'PATH_INFO': '/else', 'SCRIPT_NAME': '/some/thing'}
+
+    environ = {'SCRIPT_NAME': '', 'PATH_INFO': '/some/thing/'}
+    assert node.resolve(environ) is other_app
+    assert environ == {'PATH_INFO': '/', 'SCRIPT_NAME': '/some/thing'}
+
+    environ = {'SCRIPT_NAME': '', 'PATH_INFO': 'relative'}
+    with pytest.raises(HTTPError) as exc:
+        node.resolve(environ)
+    assert exc.value.status == 404
+
+
+def test_mapping_resolve_cache_invalidation():
+    node = Mapping({"/": basic_app})
+    environ = {'SCRIPT_NAME': '', 'PATH_INFO': '/backend/test'}
+    assert node.resolve(environ) is basic_app
+    assert environ == {'PATH_INFO': '/backend/test', 'SCRIPT_NAME': ''}
+
+    node['/backend'] = other_app
+    environ = {'SCRIPT_NAME': '', 'PATH_INFO': '/backend/test'}
+    assert node.resolve(environ) is other_app
+    assert environ == {'PATH_INFO': '/test', 'SCRIPT_NAME': '/backend'}
+
+    copy = node.copy()
+    del node['/backend']
+    environ = {'SCRIPT_NAME': '', 'PATH_INFO': '/backend/test'}
+    assert node.resolve(environ) is basic_app
+
+    environ = {'SCRIPT_NAME': '', 'PATH_INFO': '/backend/test'}
+    assert copy.resolve(environ) is other_app
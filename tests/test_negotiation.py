@@ -0,0 +1,66 @@
+from horseman.datastructures import MediaType
+from horseman.environ import WSGIEnvironWrapper
+from horseman.negotiation import (
+    Negotiator, negotiate_charset, negotiate_language, parse_accept)
+
+
+def test_parse_accept():
+    ranges = parse_accept(
+        'text/*;q=0.3, text/html;q=0.7, text/html;level=1, '
+        'text/html;level=2;q=0.4, */*;q=0.5, invalid, a/b/c')
+    assert ranges == (
+        'text/html; level=1',
+        'text/html; q=0.7',
+        '*/*; q=0.5',
+        'text/html; level=2; q=0.4',
+        'text/*; q=0.3',
+    )
+    assert all(isinstance(media, MediaType) for media in ranges)
+    assert [media.quality for media in ranges] == [1, .7, .5, .4, .3]
+    assert parse_accept('') == ()
+
+    environ = WSGIEnvironWrapper({'HTTP_ACCEPT': 'application/json'})
+    assert environ.accept == ('application/json',)
+
+
+def test_negotiator():
+    negotiator = Negotiator(['application/json', 'text/html'])
+    assert negotiator.negotiate('text/html') == 'text/html'
+    assert negotiator.negotiate('*/*') == 'application/json'
+    assert negotiator.negotiate('') == 'application/json'
+    assert negotiator.negotiate(
+        'application/json;q=0.5, text/*') == 'text/html'
+    assert negotiator.negotiate('TEXT/HTML;q=0.9, */*;q=0.8') == (
+        'text/html')
+    assert negotiator.negotiate('image/png') is None
+
+    # The most specific range gives the quality of an offer.
+    assert negotiator.negotiate('*/*, application/json;q=0') == (
+        'text/html')
+    assert negotiator.negotiate('text/html;level=1') is None
+
+    negotiator = Negotiator(['text/html;level=1', 'text/html'])
+    assert negotiator.negotiate(
+        'text/html;level=1;q=0.2, text/html') == 'text/html'
+
+    # Choices are cached per header value.
+    negotiator = Negotiator(['application/json'])
+    assert negotiator.negotiate('*/*') is negotiator.negotiate('*/*')
+    assert negotiator._negotiate.cache_info().hits == 1
+
+
+def test_negotiate_language_and_charset():
+    available = ('en-US', 'fr', 'de')
+    assert negotiate_language('', available) == 'en-US'
+    assert negotiate_language('fr-CH, fr;q=0.9, en;q=0.8', available) == (
+        'fr')
+    assert negotiate_language('en', available) == 'en-US'
+    assert negotiate_language('it, *;q=0.1', available) == 'en-US'
+    assert negotiate_language('it, de;q=0', available) is None
+
+    available = ('utf-8', 'iso-8859-1')
+    assert negotiate_charset('', available) == 'utf-8'
+    assert negotiate_charset(
+        'iso-8859-1, utf-8;q=0.5', available) == 'iso-8859-1'
+    assert negotiate_charset('*;q=0.1, UTF-8', available) == 'utf-8'
+    assert negotiate_charset('ascii', available) is None
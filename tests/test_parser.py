@@ -73,3 +73,79 @@ def test_parser_with_mimetype():
 
     data = parser.parse(BytesIO(b'body'), contenttype)
     assert isinstance(data, Data)
+
+
+def test_parser_suffix_and_wildcard_resolution():
+    parser = BodyParser()
+
+    @parser.register('application/json')
+    def json(body, mimetype, **options):
+        return Data(json=mimetype)
+
+    @parser.register('text/*')
+    def text(body, mimetype, **options):
+        return Data(form=[('mimetype', mimetype)])
+
+    assert parser.find('application/vnd.api+json') is json
+    assert parser.find('application/merge-patch+json') is json
+    assert parser.find('Application/JSON') is json
+    assert parser.find('text/csv') is text
+    assert parser.find('image/png') is None
+
+    data = parser.parse(BytesIO(b''), 'application/vnd.api+json')
+    assert data.json == 'application/vnd.api+json'
+
+    with pytest.raises(HTTPError) as exc:
+        parser.parse(BytesIO(b''), 'application/vnd.custom+xml')
+    assert exc.value.body == (
+        "Unknown content type: 'application/vnd.custom+xml'.")
+
+    @parser.register('*/*')
+    def fallback(body, mimetype, **options):
+        return Data()
+
+    # Registration clears the resolution cache.
+    assert parser.parse(
+        BytesIO(b''), 'application/vnd.custom+xml') == Data()
+
+
+def test_parser_resolution_cache():
+    parser = BodyParser()
+
+    @parser.register('foo/bar')
+    def test(body, mimetype, **options):
+        return Data(form=list(options.items()))
+
+    header = 'foo/bar; charset=UTF-8'
+    assert parser.parse(BytesIO(b''), header) == Data(
+        form=[('charset', 'UTF-8')])
+    assert parser.parse(BytesIO(b''), header) == Data(
+        form=[('charset', 'UTF-8')])
+    info = parser._resolve.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+    del parser['foo/bar']
+    assert parser._resolve.cache_info().currsize == 0
+
+
+def test_parser_resolution_cache_dict_methods():
+    def test(body, mimetype, **options):
+        return Data()
+
+    parser = BodyParser()
+    for method, args in (
+            ('update', ({'foo/bar': test},)),
+            ('setdefault', ('foo/baz', test)),
+            ('pop', ('foo/baz',)),
+            ('popitem', ()),
+            ('clear', ())):
+        parser._resolve('foo/bar')
+        assert parser._resolve.cache_info().currsize == 1
+        getattr(parser, method)(*args)
+        assert parser._resolve.cache_info().currsize == 0
+
+    parser.update({'foo/bar': test})
+    assert parser.parse(BytesIO(b''), 'foo/bar') == Data()
+    parser.clear()
+    with pytest.raises(HTTPError):
+        parser.parse(BytesIO(b''), 'foo/bar')
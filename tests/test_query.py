@@ -95,3 +95,31 @@ def test_int_should_cast_to_int():
     query = Query.from_string(request.environ['QUERY_STRING'])
     with pytest.raises(ValueError):
         query.as_int('key')
+
+
+def test_query_parsing():
+    query = Query.from_string('a=1&b=%C3%A9+x&a=2&c=&a=3')
+    assert query == Query({
+        'a': ('1', '2', '3'), 'b': ('é x',), 'c': ('',)})
+    assert query.getlist('a') == ('1', '2', '3')
+
+    with pytest.raises(ValueError):
+        Query.from_string('a=1&b')
+    assert Query.from_string('a=1&&b', strict_parsing=False) == Query({
+        'a': ('1',), 'b': ('',)})
+    assert Query.from_string(
+        'a=1&b=', strict_parsing=False, keep_blank_values=False
+    ) == Query({'a': ('1',)})
+    with pytest.raises(ValueError):
+        Query.from_string('a=1&b=2', max_num_fields=1)
+
+
+def test_query_cache():
+    query = Query.from_cache('page=2&size=20')
+    assert query == Query({'page': ('2',), 'size': ('20',)})
+    assert Query.from_cache('page=2&size=20') is query
+
+    long = '&'.join(f'key{i}={i}' for i in range(200))
+    assert len(long) > Query.CACHE_MAX_LENGTH
+    assert Query.from_cache(long) == Query.from_string(long)
+    assert Query.from_cache(long) is not Query.from_cache(long)
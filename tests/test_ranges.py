@@ -0,0 +1,130 @@
+from http import HTTPStatus
+from unittest.mock import Mock
+from horseman.response import Response, FileResponse
+from horseman.utils import parse_range
+
+
+BODY = b'0123456789' * 10
+
+
+def test_parse_range():
+    assert parse_range('bytes=0-9', 100) == [(0, 10)]
+    assert parse_range('bytes=90-', 100) == [(90, 100)]
+    assert parse_range('bytes=-5', 100) == [(95, 100)]
+    assert parse_range('bytes=-500', 100) == [(0, 100)]
+    assert parse_range('bytes=95-200', 100) == [(95, 100)]
+    assert parse_range('bytes=0-1, 5-6', 100) == [(0, 2), (5, 7)]
+    assert parse_range('bytes=100-', 100) == []
+    assert parse_range('bytes=-0', 100) == []
+    assert parse_range('items=0-1', 100) is None
+    assert parse_range('bytes=5-1', 100) is None
+    assert parse_range('bytes=a-b', 100) is None
+    assert parse_range('bytes=1', 100) is None
+
+
+def test_single_range():
+    start_response = Mock()
+    response = Response(body=BODY, headers={'Content-Type': 'text/plain'})
+    response.partial({'HTTP_RANGE': 'bytes=10-19'})
+    assert response.status == HTTPStatus.PARTIAL_CONTENT
+    assert list(response({}, start_response)) == [b'0123456789']
+    start_response.assert_called_with('206 Partial Content', [
+        ('Content-Type', 'text/plain'),
+        ('Accept-Ranges', 'bytes'),
+        ('Content-Range', 'bytes 10-19/100'),
+        ('Content-Length', '10'),
+    ])
+
+
+def test_no_range():
+    response = Response(body=BODY).partial({})
+    assert response.status == HTTPStatus.OK
+    assert response.headers['Accept-Ranges'] == 'bytes'
+
+    response = Response(body=iter([BODY])).partial(
+        {'HTTP_RANGE': 'bytes=0-1'})
+    assert response.status == HTTPStatus.OK
+    assert 'Accept-Ranges' not in response.headers
+
+    response = Response(body=BODY).partial(
+        {'HTTP_RANGE': 'bytes=0-1', 'REQUEST_METHOD': 'POST'})
+    assert response.status == HTTPStatus.OK
+
+
+def test_unsatisfiable_range(tmp_path):
+    start_response = Mock()
+    response = Response(body=BODY).partial({'HTTP_RANGE': 'bytes=200-'})
+    assert response.status == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    list(response({}, start_response))
+    assert ('Content-Range', 'bytes */100') in start_response.call_args[0][1]
+
+    path = tmp_path / 'test.txt'
+    path.write_bytes(BODY)
+    original = FileResponse(path)
+    response = original.partial({'HTTP_RANGE': 'bytes=100-'})
+    assert response.headers['Content-Range'] == 'bytes */100'
+    response.close()
+    assert original.body.closed
+
+
+def test_if_range():
+    response = Response(body=BODY, headers={'ETag': '"v1"'}).partial({
+        'HTTP_RANGE': 'bytes=0-1', 'HTTP_IF_RANGE': '"v1"'})
+    assert response.status == HTTPStatus.PARTIAL_CONTENT
+
+    response = Response(body=BODY, headers={'ETag': '"v1"'}).partial({
+        'HTTP_RANGE': 'bytes=0-1', 'HTTP_IF_RANGE': '"v2"'})
+    assert response.status == HTTPStatus.OK
+
+    response = Response(body=BODY, headers={'ETag': 'W/"v1"'}).partial({
+        'HTTP_RANGE': 'bytes=0-1', 'HTTP_IF_RANGE': 'W/"v1"'})
+    assert response.status == HTTPStatus.OK
+
+    date = 'Tue, 24 Mar 2026 12:30:00 GMT'
+    response = Response(body=BODY, headers={'Last-Modified': date}).partial({
+        'HTTP_RANGE': 'bytes=0-1', 'HTTP_IF_RANGE': date})
+    assert response.status == HTTPStatus.PARTIAL_CONTENT
+
+
+def test_multiple_ranges():
+    start_response = Mock()
+    response = Response(body=BODY, headers={'Content-Type': 'text/plain'})
+    response.partial({'HTTP_RANGE': 'bytes=0-1,-2'})
+    body = b''.join(response({}, start_response))
+    headers = dict(start_response.call_args[0][1])
+    boundary = headers['Content-Type'].split('boundary=')[1]
+    assert body == (
+        f'--{boundary}\r\n'
+        'Content-Type: text/plain\r\n'
+        'Content-Range: bytes 0-1/100\r\n\r\n01\r\n'
+        f'--{boundary}\r\n'
+        'Content-Type: text/plain\r\n'
+        'Content-Range: bytes 98-99/100\r\n\r\n89\r\n'
+        f'--{boundary}--\r\n'
+    ).encode()
+    assert int(headers['Content-Length']) == len(body)
+
+
+def test_file_ranges(tmp_path):
+    path = tmp_path / 'test.txt'
+    path.write_bytes(BODY)
+
+    environ = {'HTTP_RANGE': 'bytes=95-', 'wsgi.file_wrapper': Mock()}
+    start_response = Mock()
+    response = FileResponse(path).partial(environ)
+    assert b''.join(response(environ, start_response)) == b'56789'
+    assert response.headers['Content-Range'] == 'bytes 95-99/100'
+    assert response.headers['Content-Length'] == '5'
+    environ['wsgi.file_wrapper'].assert_not_called()
+    response.close()
+
+    fd = open(path, 'rb')
+    fd.seek(50)
+    response = FileResponse(fd, block_size=4).partial(
+        {'HTTP_RANGE': 'bytes=0-9, 20-'})
+    chunks = list(response)
+    assert b'0123456789' in b''.join(chunks)
+    assert int(response.headers['Content-Length']) == len(b''.join(chunks))
+    assert response.headers['Content-Type'].startswith(
+        'multipart/byteranges; boundary=')
+    response.close()
@@ -36,17 +36,51 @@ def test_bytes_representation_bodyless():
     assert response.body == (
         b'Request accepted, processing continues off-line'
     )
-    assert list(response.headers.items()) == [('Content-Length', '47')]
+    assert list(response.headers.items()) == [
+        ('Content-Type', 'text/plain; charset=utf-8'),
+        ('Content-Length', '47'),
+    ]
 
 
 def test_representation_with_body():
-    app = webtest.TestApp(
-        Response(HTTPStatus.OK, body="Super")
-    )
+    wsgi = Response(HTTPStatus.OK, body="Super")
+    app = webtest.TestApp(wsgi)
     response = app.get('/')
     assert response.status_int == 200
     assert response.body == b'Super'
-    assert list(response.headers.items()) == [('Content-Length', '5')]
+    assert list(response.headers.items()) == [
+        ('Content-Type', 'text/plain; charset=utf-8'),
+        ('Content-Length', '5'),
+    ]
+    assert wsgi.body == b'Super'  # encoded once.
+
+
+def test_content_length():
+    start_response = Mock()
+    response = Response(
+        HTTPStatus.OK, body="Dédé", headers={'Content-Type': 'text/plain'})
+    assert list(response({}, start_response)) == ['Dédé'.encode()]
+    start_response.assert_called_with('200 OK', [
+        ('Content-Type', 'text/plain'),
+        ('Content-Length', '6'),
+    ])
+
+    response = Response(HTTPStatus.OK, body=b'', headers={
+        'content-length': '0'})
+    response({}, start_response)
+    start_response.assert_called_with(
+        '200 OK', [('content-length', '0')])
+
+    response = Response(HTTPStatus.OK, body=iter([b'abc']))
+    response({}, start_response)
+    start_response.assert_called_with('200 OK', [])
+
+    response = Response(
+        HTTPStatus.OK, body=iter([b'abc']),
+        headers={'Content-Length': '3'}
+    )
+    response({}, start_response)
+    start_response.assert_called_with('200 OK', [('Content-Length', '3')])
 
 
 def test_representation_bodyless_with_body():
@@ -156,3 +190,30 @@ def test_exception_finisher():
     response.close()
     assert calls == [1, 3]
     assert len(response._finishers) == 0
+
+
+def test_coalesced_body():
+    response = Response(
+        body=(b'x' * 10 for _ in range(25)), buffer_size=100)
+    assert [len(chunk) for chunk in response] == [100, 100, 50]
+
+    response = Response(
+        body=iter([b'a', b'b' * 200, b'c', b'd']), buffer_size=100)
+    assert list(response) == [b'a' + b'b' * 200, b'cd']
+
+    response = Response(body=iter([b'b' * 200, b'c']), buffer_size=100)
+    assert list(response) == [b'b' * 200, b'c']
+
+
+def test_coalesced_body_flush_interval():
+    import time
+
+    def slow_producer():
+        yield b'first'
+        time.sleep(0.02)
+        yield b'second'
+        yield b'third'
+
+    response = Response(
+        body=slow_producer(), buffer_size=1024, flush_interval=0.01)
+    assert list(response) == [b'firstsecond', b'third']
@@ -0,0 +1,94 @@
+import pytest
+import webtest
+from io import BytesIO
+from unittest.mock import Mock
+from wsgiref.util import FileWrapper
+from horseman.mapping import Mapping
+from horseman.response import FileResponse
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    path = tmp_path / 'test.txt'
+    path.write_bytes(b'0123456789' * 1000)
+    return path
+
+
+def test_file_response_headers(text_file):
+    response = FileResponse(text_file)
+    assert response.headers['Content-Length'] == '10000'
+    assert response.headers['Content-Type'] == 'text/plain'
+    response.close()
+    assert response.body.closed
+
+
+def test_file_response_mmap_iteration(text_file):
+    response = FileResponse(text_file, block_size=4096)
+    chunks = list(response(
+        {'PATH_INFO': '/'}, Mock()))
+    assert [len(chunk) for chunk in chunks] == [4096, 4096, 1808]
+    assert b''.join(chunks) == text_file.read_bytes()
+    response.close()
+    assert response.body.closed
+
+
+def test_file_response_from_offset(text_file):
+    fd = open(text_file, 'rb')
+    fd.seek(9995)
+    response = FileResponse(fd, content_type='application/octet-stream')
+    assert response.headers['Content-Length'] == '5'
+    assert response.headers['Content-Type'] == 'application/octet-stream'
+    assert list(response) == [b'56789']
+    response.close()
+    assert fd.closed
+
+
+def test_file_response_empty_file(tmp_path):
+    path = tmp_path / 'empty.bin'
+    path.write_bytes(b'')
+    response = FileResponse(path)
+    assert response.headers['Content-Length'] == '0'
+    assert list(response) == []
+    response.close()
+
+
+def test_file_response_without_descriptor():
+    response = FileResponse(BytesIO(b'abcdef'), block_size=4)
+    assert 'Content-Length' not in response.headers
+    assert list(response) == [b'abcd', b'ef']
+
+
+def test_file_response_file_wrapper(text_file):
+    start_response = Mock()
+    response = FileResponse(text_file)
+    iterable = response(
+        {'PATH_INFO': '/', 'wsgi.file_wrapper': FileWrapper},
+        start_response
+    )
+    assert isinstance(iterable, FileWrapper)
+    assert iterable.filelike is response
+    assert b''.join(iterable) == text_file.read_bytes()
+    iterable.close()
+    assert response.body.closed
+
+
+def test_file_response_file_wrapper_through_mapping(text_file):
+    response = FileResponse(text_file)
+    app = Mapping({'/file': response})
+    iterable = app(
+        {'SCRIPT_NAME': '', 'PATH_INFO': '/file',
+         'wsgi.file_wrapper': FileWrapper},
+        Mock()
+    )
+    assert isinstance(iterable, FileWrapper)
+    assert iterable.filelike is response
+    assert b''.join(iterable) == text_file.read_bytes()
+    iterable.close()
+    assert response.body.closed
+
+
+def test_file_response_webtest(text_file):
+    app = webtest.TestApp(FileResponse(text_file))
+    response = app.get('/')
+    assert response.body == text_file.read_bytes()
+    assert response.headers['Content-Length'] == '10000'
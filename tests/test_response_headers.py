@@ -1,5 +1,6 @@
 import hamcrest
-from horseman.response import Headers
+from unittest.mock import Mock
+from horseman.response import Headers, FrozenHeaders, Response
 
 
 def test_empty_headers():
@@ -100,3 +101,54 @@ def test_headers_coalescence_with_cookies():
                            'test="{\'this\': \'is json\'}"; Path=/')
         )
     )
+
+
+def test_frozen_headers():
+    headers = Headers({'X-Frame-Options': 'DENY'})
+    headers.cookies.set('test', 'value')
+    frozen = headers.freeze()
+    assert isinstance(frozen, FrozenHeaders)
+    assert frozen == (
+        ('X-Frame-Options', 'DENY'),
+        ('Set-Cookie', 'test=value; Path=/'),
+    )
+    assert FrozenHeaders(frozen) is frozen
+    assert FrozenHeaders({'Content-Length': 12}) == (
+        ('Content-Length', '12'),
+    )
+    assert frozen + [('Vary', 'Origin')] == (
+        ('X-Frame-Options', 'DENY'),
+        ('Set-Cookie', 'test=value; Path=/'),
+        ('Vary', 'Origin'),
+    )
+
+
+def test_frozen_headers_copy_on_write():
+    shared = FrozenHeaders({'X-Frame-Options': 'DENY'})
+
+    start_response = Mock()
+    response = Response(200, body=b'', headers=shared)
+    response(None, start_response)
+    start_response.assert_called_with(
+        '200 OK', [('X-Frame-Options', 'DENY'), ('Content-Length', '0')])
+    assert response._headers is None
+
+    response = Response(200, body=b'', headers=shared)
+    response.headers.add('Vary', 'Origin')
+    response.cookies.set('test', 'value')
+    response(None, start_response)
+    start_response.assert_called_with('200 OK', [
+        ('X-Frame-Options', 'DENY'),
+        ('Vary', 'Origin'),
+        ('Set-Cookie', 'test=value; Path=/'),
+        ('Content-Length', '0'),
+    ])
+    assert shared == (('X-Frame-Options', 'DENY'),)
+
+
+def test_response_headers_assignment():
+    response = Response(200, headers={'Link': 'test'})
+    assert response.headers['link'] == 'test'
+    response.headers = [('Vary', 'Origin')]
+    assert isinstance(response.headers, Headers)
+    assert response.header_list() == [('Vary', 'Origin')]
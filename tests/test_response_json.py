@@ -0,0 +1,76 @@
+import orjson
+import pytest
+from dataclasses import dataclass
+from http import HTTPStatus
+from unittest.mock import Mock
+from horseman.response import JSONResponse
+
+
+@dataclass
+class Item:
+    name: str
+    price: float
+
+
+def test_json_response():
+    start_response = Mock()
+    response = JSONResponse({'items': [Item('saddle', 12.5)]})
+    assert response.body == b'{"items":[{"name":"saddle","price":12.5}]}'
+    assert list(response({}, start_response)) == [response.body]
+    start_response.assert_called_with('200 OK', [
+        ('Content-Type', 'application/json'),
+        ('Content-Length', '42'),
+    ])
+
+
+def test_json_response_headers():
+    response = JSONResponse([], headers={'X-Total': '0'})
+    assert response.header_list() == [
+        ('X-Total', '0'),
+        ('Content-Type', 'application/json'),
+    ]
+    response = JSONResponse([], headers={
+        'Content-Type': 'application/vnd.api+json'})
+    assert response.headers['Content-Type'] == 'application/vnd.api+json'
+
+
+def test_json_response_options():
+    response = JSONResponse({1: 'one'}, option=orjson.OPT_NON_STR_KEYS)
+    assert response.body == b'{"1":"one"}'
+
+    with pytest.raises(TypeError):
+        JSONResponse({1: 'one'})
+
+    response = JSONResponse({'value': {1, 2}}, default=sorted)
+    assert response.body == b'{"value":[1,2]}'
+
+
+def test_json_response_lazy():
+    response = JSONResponse({1: 'one'}, lazy=True)
+    assert response.body is None  # no error yet.
+
+    response = JSONResponse(
+        {'value': 1}, status=HTTPStatus.NO_CONTENT, lazy=True)
+    start_response = Mock()
+    assert list(response({}, start_response)) == []
+    assert response.body is None
+    start_response.assert_called_with(
+        '204 No Content', [('Content-Type', 'application/json')])
+
+    response = JSONResponse({'value': 1}, lazy=True)
+    assert list(response) == [b'{"value":1}']
+
+
+def test_json_response_precondition_failed():
+    environ = {'HTTP_IF_NONE_MATCH': '*', 'REQUEST_METHOD': 'PUT'}
+    for lazy in (False, True):
+        start_response = Mock()
+        response = JSONResponse({'a': 1}, lazy=lazy).conditional(
+            environ, etag='"v1"')
+        assert response.status == HTTPStatus.PRECONDITION_FAILED
+        assert list(response({}, start_response)) == [
+            b'Precondition in headers is false']
+        start_response.assert_called_with('412 Precondition Failed', [
+            ('Content-Type', 'text/plain; charset=utf-8'),
+            ('Content-Length', '32'),
+        ])
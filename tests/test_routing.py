@@ -0,0 +1,137 @@
+import pytest
+import uuid
+from unittest.mock import Mock
+from horseman.routing import Router
+from horseman.exceptions import HTTPError
+from horseman.environ import WSGIEnvironWrapper
+
+
+def basic_app(environ, start_fn):
+    start_fn('200 OK', [('Content-Type', 'text/plain')])
+    return [b"Hello World!\n"]
+
+
+def other_app(environ, start_fn):
+    start_fn('200 OK', [('Content-Type', 'text/plain')])
+    return [b"Something else\n"]
+
+
+def third_app(environ, start_fn):
+    start_fn('200 OK', [('Content-Type', 'text/plain')])
+    return [b"Something else entirely\n"]
+
+
+def test_router_static():
+    router = Router({'/': basic_app, '/users': other_app})
+    assert router.match('/') == (basic_app, {})
+    assert router.match('/users') == (other_app, {})
+    assert router.match('/users/') is None
+    assert router.match('/nothing') is None
+    assert router.match('relative') is None
+
+
+def test_router_params():
+    router = Router({
+        '/users/{id:int}': basic_app,
+        '/users/{id:int}/files/{path:path}': other_app,
+        '/users/{name}': third_app,
+    })
+    assert router.match('/users/12') == (basic_app, {'id': 12})
+    assert router.match('/users/bob') == (third_app, {'name': 'bob'})
+    assert router.match('/users/12/files/a/b/c.txt') == (
+        other_app, {'id': 12, 'path': 'a/b/c.txt'})
+    assert router.match('/users/12/files/') is None
+    assert router.match('/users/') is None
+
+    ident = uuid.uuid4()
+    router['/items/{ident:uuid}'] = basic_app
+    assert router.match(f'/items/{ident}') == (basic_app, {'ident': ident})
+    assert router.match('/items/12') is None
+
+
+def test_router_static_precedence_and_backtracking():
+    router = Router({
+        '/users/me/profile': basic_app,
+        '/users/{name}/settings': other_app,
+    })
+    assert router.match('/users/me/profile') == (basic_app, {})
+    assert router.match('/users/me/settings') == (
+        other_app, {'name': 'me'})
+
+
+def test_router_utf8_params():
+    router = Router({'/tags/{tag}': basic_app})
+    path_info = '/tags/été'.encode('utf-8').decode('latin-1')
+    assert router.match(path_info) == (basic_app, {'tag': 'été'})
+
+
+def test_router_invalid_patterns():
+    router = Router()
+    with pytest.raises(ValueError):
+        router['users'] = basic_app
+    with pytest.raises(ValueError):
+        router['/users/{id:unknown}'] = basic_app
+    with pytest.raises(ValueError):
+        router['/users/{id}/{id}'] = basic_app
+    with pytest.raises(ValueError):
+        router['/files/{path:path}/edit'] = basic_app
+    with pytest.raises(ValueError):
+        router['/files/{name}.json'] = basic_app
+    assert router == {}
+
+
+def test_router_conflicts():
+    router = Router({'/a/{x}': basic_app})
+    with pytest.raises(ValueError):
+        router['/a/{y}'] = other_app
+    assert router == {'/a/{x}': basic_app}
+    assert router.match('/a/1') == (basic_app, {'x': '1'})
+
+    # Replacing the script of a pattern is not a conflict.
+    router['/a/{x}'] = other_app
+    assert router.match('/a/1') == (other_app, {'x': '1'})
+
+
+def test_router_float():
+    router = Router({'/price/{amount:float}': basic_app})
+    assert router.match('/price/12') == (basic_app, {'amount': 12.0})
+    assert router.match('/price/12.50') == (basic_app, {'amount': 12.5})
+    for segment in ('nan', 'inf', '1_0', '1e3', '-1', '.5', '1.'):
+        assert router.match(f'/price/{segment}') is None
+
+
+def test_router_delete():
+    router = Router({'/users/{id:int}': basic_app, '/about': other_app})
+    del router['/users/{id:int}']
+    assert router.match('/users/12') is None
+    assert router.match('/about') == (other_app, {})
+
+
+def test_router_resolve():
+    router = Router({'/users/{id:int}': basic_app})
+    environ = {'SCRIPT_NAME': '', 'PATH_INFO': '/users/3'}
+    assert router.resolve(environ) is basic_app
+    assert environ['PATH_PARAMS'] == {'id': 3}
+    assert WSGIEnvironWrapper(environ).params == {'id': 3}
+
+    environ = {'SCRIPT_NAME': '', 'PATH_INFO': '/users/abc'}
+    with pytest.raises(HTTPError) as exc:
+        router.resolve(environ)
+    assert exc.value.status == 404
+    assert 'PATH_PARAMS' not in environ
+
+
+def test_router_call():
+    start_response = Mock()
+    router = Router({'/users/{id:int}': basic_app})
+
+    environ = {'SCRIPT_NAME': '', 'PATH_INFO': '/users/1'}
+    assert list(router(environ, start_response)) == [b'Hello World!\n']
+
+    environ = {'SCRIPT_NAME': '', 'PATH_INFO': '/users/x'}
+    list(router(environ, start_response))
+    start_response.assert_called_with(
+        '404 Not Found', [
+            ('Content-Type', 'text/plain; charset=utf-8'),
+            ('Content-Length', '29'),
+        ])
@@ -0,0 +1,194 @@
+import pytest
+from io import BytesIO
+from webtest.app import TestRequest as Request
+from horseman.environ import WSGIEnvironWrapper
+from horseman.exceptions import HTTPError
+from horseman.streams import InputStream, ReplayableStream, read_body
+
+
+class Unsized:
+    """A stream without readinto, like some server inputs."""
+
+    def __init__(self, data):
+        self._stream = BytesIO(data)
+
+    def read(self, size=-1):
+        return self._stream.read(size)
+
+
+def test_input_stream_bounds():
+    stream = InputStream(BytesIO(b'abcdef'), 4)
+    assert stream.read() == b'abcd'
+    assert stream.read() == b''
+
+    stream = InputStream(BytesIO(b'abcdef'), 4)
+    assert stream.read(3) == b'abc'
+    assert stream.read(3) == b'd'
+
+    stream = InputStream(Unsized(b'abcdef'), 4)
+    buffer = bytearray(10)
+    assert stream.readinto(buffer) == 4
+    assert buffer[:4] == b'abcd'
+    assert stream.readinto(buffer) == 0
+
+
+def test_input_stream_from_environ():
+    stream = InputStream.from_environ(
+        {'wsgi.input': BytesIO(b'abc'), 'CONTENT_LENGTH': '2'})
+    assert stream.length == 2
+    assert stream.read() == b'ab'
+
+    stream = InputStream.from_environ({'wsgi.input': BytesIO(b'abc')})
+    assert stream.length == 0
+    assert stream.read() == b''
+
+    stream = InputStream.from_environ(
+        {'wsgi.input': BytesIO(b'abc'), 'wsgi.input_terminated': True})
+    assert stream.length is None
+    assert stream.read() == b'abc'
+
+    with pytest.raises(HTTPError) as exc:
+        InputStream.from_environ(
+            {'wsgi.input': BytesIO(b'abc'), 'CONTENT_LENGTH': 'abc'})
+    assert exc.value.status == 400
+
+
+def test_input_stream_max_size():
+    with pytest.raises(HTTPError) as exc:
+        InputStream(BytesIO(b'abcdef'), 6, max_size=5)
+    assert exc.value.status == 413
+
+    stream = InputStream(BytesIO(b'abcdef'), None, max_size=5)
+    assert stream.read(5) == b'abcde'
+    with pytest.raises(HTTPError) as exc:
+        stream.read()
+    assert exc.value.status == 413
+
+
+def test_read_body():
+    body = read_body(InputStream(BytesIO(b'abcdef'), 4))
+    assert isinstance(body, bytearray)
+    assert body == b'abcd'
+
+    with pytest.raises(HTTPError) as exc:
+        read_body(InputStream(BytesIO(b'ab'), 4))
+    assert exc.value.status == 400
+    assert exc.value.body == 'Body is shorter than its Content-Length.'
+
+    assert read_body(BytesIO(b'abc')) == b'abc'
+
+    # The buffer grows with the data, up to the declared length.
+    data = bytes(range(256)) * 1000
+    assert read_body(InputStream(BytesIO(data), len(data))) == data
+
+
+def test_read_body_lying_length():
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        with pytest.raises(HTTPError) as exc:
+            read_body(InputStream(BytesIO(b'{"a": 1}'), 524288000))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert exc.value.status == 400
+    assert peak < 1024 * 1024
+
+
+def test_input_stream_unknown_length_reads_bounded():
+    sizes = []
+
+    class Recording(BytesIO):
+        def read(self, size=-1):
+            sizes.append(size)
+            return super().read(size)
+
+    stream = InputStream(Recording(b'x' * 100), None, max_size=10)
+    with pytest.raises(HTTPError) as exc:
+        stream.read()
+    assert exc.value.status == 413
+    assert sizes == [11]
+
+    sizes.clear()
+    stream = InputStream(Recording(b'x' * 10), None, max_size=10)
+    assert stream.read() == b'x' * 10
+    assert max(sizes) <= 11
+
+
+def test_environ_data_bounded():
+    request = Request.blank(
+        '/', method='POST', body=b'{"foo": "bar"}',
+        content_type='application/json'
+    )
+    environ = WSGIEnvironWrapper(request.environ)
+    assert environ.data.json == {'foo': 'bar'}
+
+    class Limited(WSGIEnvironWrapper):
+        max_body_size = 10
+
+    request = Request.blank(
+        '/', method='POST', body=b'{"foo": "bar"}',
+        content_type='application/json'
+    )
+    environ = Limited(request.environ)
+    with pytest.raises(HTTPError) as exc:
+        environ.data
+    assert exc.value.status == 413
+    assert request.environ['wsgi.input'].tell() == 0
+
+
+def test_replayable_stream():
+    source = BytesIO(b'abcdefgh')
+    stream = ReplayableStream(InputStream(source, 6))
+    assert stream.seekable()
+    assert stream.length == 6
+    assert stream.read(2) == b'ab'
+    assert stream.length == 4
+    assert stream.seek(0) == 0
+    assert stream.read(4) == b'abcd'
+    assert stream.read() == b'ef'
+    assert stream.tell() == 6
+    assert source.tell() == 6  # the source is read once.
+    stream.seek(1)
+    assert read_body(stream) == b'bcdef'
+
+    stream = ReplayableStream(InputStream(Unsized(b'abcdefgh'), None))
+    assert stream.length is None
+    assert stream.seek(3) == 3
+    assert stream.read(2) == b'de'
+    assert stream.seek(-1, 1) == 4
+    assert stream.read() == b'efgh'
+    assert stream.seek(0, 2) == 8
+    assert stream.seek(-8, 2) == 0
+    assert stream.read() == b'abcdefgh'
+    assert stream.seek(20) == 8
+    with pytest.raises(ValueError):
+        stream.seek(-1)
+
+
+def test_replayable_stream_spooling():
+    ReplayableStream.SPOOL_THRESHOLD = 4
+    try:
+        stream = ReplayableStream(InputStream(BytesIO(b'abcdefgh'), 8))
+        assert stream.read() == b'abcdefgh'
+        assert stream._spool._rolled
+        stream.seek(2)
+        assert stream.read(3) == b'cde'
+    finally:
+        ReplayableStream.SPOOL_THRESHOLD = 1024 * 1024
+
+
+def test_environ_body_and_data():
+    request = Request.blank('/', method='POST', POST={'a': '1'})
+    environ = WSGIEnvironWrapper(request.environ)
+    body = environ.body.read()
+    assert body == b'a=1'
+    assert environ.data.form == [('a', '1')]
+    assert environ.body.read() == b'a=1'
+
+    # The recorded body is shared by the wrappers of the environ.
+    other = WSGIEnvironWrapper(request.environ)
+    assert other.body is environ.body
+    other.body.seek(0)
+    assert other.body.read() == b'a=1'